@@ -0,0 +1,250 @@
+"""Voice-guided cooking agent for Su-Chef.
+
+Loads a prepared recipe (steps.json, written by the recipe manager) and
+walks the user through it step by step, using Azure Speech for both
+text-to-speech and speech recognition.
+"""
+
+import json
+import mmap
+import os
+import re
+
+import azure.cognitiveservices.speech as speechsdk
+from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Keywords that tell us what a step is "about". Each step is scanned once
+# with this regex and the resulting flags are cached, so the per-turn
+# heuristics below are set/dict lookups instead of repeated substring scans.
+_STEP_KEYWORD_RE = re.compile(
+    r"\b(heat|temperature|preheat|boil|simmer|bake|fry|time|minutes?|"
+    r"mix|stir|whisk|oil|butter|onion|garlic|chop|cut|slice|dice)\b",
+    re.IGNORECASE,
+)
+
+# Canonical flag for every keyword the regex can produce.
+_KEYWORD_FLAGS = {
+    "heat": "heat", "temperature": "heat", "preheat": "heat",
+    "boil": "heat", "simmer": "heat", "bake": "heat", "fry": "heat",
+    "time": "time", "minute": "time", "minutes": "time",
+    "mix": "mix", "stir": "mix", "whisk": "mix",
+    "oil": "oil", "butter": "oil",
+    "onion": "onion", "garlic": "onion",
+    "chop": "cut", "cut": "cut", "slice": "cut", "dice": "cut",
+}
+
+# What can go wrong in a step, keyed by the flags above.
+_FLAG_ISSUES = {
+    "heat": "This step involves heat - keep an eye on the temperature.",
+    "time": "Timing matters here - it may help to set a timer.",
+    "oil": "Hot oil can splatter - add ingredients gently.",
+    "onion": "Onions and garlic burn quickly - stir them often.",
+    "cut": "This step involves cutting - watch your fingers.",
+}
+
+# Proactive tips for the same flags.
+_FLAG_TIPS = {
+    "heat": "Tip: preheat the pan before adding anything so it cooks evenly.",
+    "time": "Tip: check a minute or two early, every stove is different.",
+    "mix": "Tip: mix just until combined, overmixing can ruin the texture.",
+    "oil": "Tip: the oil is ready when it shimmers.",
+    "cut": "Tip: keep your fingertips tucked in while you chop.",
+}
+
+# Words in the user's utterance that suggest they are lost or confused.
+_CONFUSION_RE = re.compile(
+    r"\b(what|how|huh|confused|lost|understand|explain|mean)\b",
+    re.IGNORECASE,
+)
+
+
+class CookingAgent:
+    """Interactive voice assistant that reads recipe steps aloud."""
+
+    def __init__(self):
+        load_dotenv()
+        self.speech_key = os.getenv("AZURE_SPEECH_KEY")
+        self.speech_region = os.getenv("AZURE_SPEECH_REGION", "eastus")
+        self.recipe_name = ""
+        self.ingredients = []
+        self.current_step = 0
+        self._steps_raw = []
+        self._steps_cache = None
+        self._step_flags = {}
+        self._setup_speech_services()
+
+    def _setup_speech_services(self):
+        speech_config = speechsdk.SpeechConfig(
+            subscription=self.speech_key, region=self.speech_region
+        )
+        speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+        self.synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
+        self.recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config)
+
+    def load_recipe(self, filename="steps.json", steps_data=None):
+        """Load a prepared recipe, in memory or from the steps file.
+
+        When the manager hands over steps_data directly there is nothing
+        to read or parse — the file round-trip only remains for playback
+        of a previously written steps.json.
+        """
+        if steps_data is not None:
+            recipe_data = steps_data
+        else:
+            try:
+                with open(filename, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as mm:
+                    # Parse straight off the page-cache-backed buffer; no
+                    # intermediate copy of the file contents.
+                    if orjson is not None:
+                        # orjson rejects mmap objects; a memoryview still
+                        # avoids copying the file contents.
+                        recipe_data = orjson.loads(memoryview(mm))
+                    else:
+                        recipe_data = json.loads(mm[:])
+            except (OSError, ValueError) as e:
+                print(f"Could not load recipe file: {e}")
+                return False
+
+        self.recipe_name = recipe_data.get("recipe_name", "your recipe")
+        self.ingredients = recipe_data.get("ingredients", [])
+        self._steps_raw = recipe_data.get("steps", [])
+        self._steps_cache = None
+        self.current_step = 0
+        self._step_flags = {}
+        return True
+
+    def load_recipe_from_bytes(self, blob):
+        """Load a recipe from serialized JSON bytes.
+
+        Lets a caller hand over a payload pulled straight from the
+        database (or any other channel) without staging it through
+        steps.json first.
+        """
+        try:
+            recipe_data = orjson.loads(blob) if orjson is not None else json.loads(blob)
+        except ValueError as e:
+            print(f"Could not parse recipe data: {e}")
+            return False
+        return self.load_recipe(steps_data=recipe_data)
+
+    @property
+    def recipe_steps(self):
+        """Step texts, extracted lazily from the parsed recipe and cached."""
+        if self._steps_cache is None:
+            self._steps_cache = [step["text"] for step in self._steps_raw]
+        return self._steps_cache
+
+    def speak(self, text):
+        print(f"🤖 {text}")
+        self.synthesizer.speak_text_async(text).get()
+
+    def listen(self):
+        print("🎤 Listening...")
+        result = self.recognizer.recognize_once_async().get()
+        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            print(f"👤 {result.text}")
+            return result.text
+        return ""
+
+    def run(self):
+        """Main voice-guidance loop."""
+        if not self.recipe_steps and not self.load_recipe():
+            return
+
+        self.speak(
+            f"Let's cook {self.recipe_name}! Say next for each step, "
+            "repeat to hear a step again, or stop when you're done."
+        )
+        self._speak_current_step()
+
+        while True:
+            command = self.listen()
+            if not command:
+                continue
+            command = command.lower()
+
+            if any(word in command for word in ("stop", "quit", "exit")):
+                self.speak("Happy cooking! Goodbye.")
+                break
+            if self._handle_navigation(command):
+                continue
+            if self._detect_confusion_patterns(command):
+                self.speak(f"No problem, here it is again. {self.recipe_steps[self.current_step]}")
+                for tip in self._generate_proactive_tips():
+                    self.speak(tip)
+
+    def _handle_navigation(self, command):
+        """Handle next/repeat/previous commands. Returns True if handled."""
+        if "next" in command or "continue" in command or "done" in command:
+            if self.current_step + 1 >= len(self.recipe_steps):
+                self.speak(f"That was the last step. {self.recipe_name} is ready, enjoy!")
+                return True
+            self.current_step += 1
+            self._flags_for_step(self.current_step)
+            self._speak_current_step()
+            return True
+        if "repeat" in command or "again" in command:
+            self._speak_current_step()
+            return True
+        if "previous" in command or "back" in command:
+            if self.current_step > 0:
+                self.current_step -= 1
+            self._speak_current_step()
+            return True
+        if "ingredient" in command:
+            self.speak("You will need: " + ", ".join(self.ingredients))
+            return True
+        return False
+
+    def _speak_current_step(self):
+        step_number = self.current_step + 1
+        self.speak(f"Step {step_number}: {self.recipe_steps[self.current_step]}")
+        for issue in self._predict_potential_issues():
+            self.speak(issue)
+
+    def _flags_for_step(self, step_index):
+        """Keyword flags for a step, computed once per step and cached."""
+        flags = self._step_flags.get(step_index)
+        if flags is None:
+            if 0 <= step_index < len(self.recipe_steps):
+                text = self.recipe_steps[step_index]
+            else:
+                text = ""
+            flags = {
+                _KEYWORD_FLAGS[match.lower()]
+                for match in _STEP_KEYWORD_RE.findall(text)
+            }
+            self._step_flags[step_index] = flags
+        return flags
+
+    def _detect_confusion_patterns(self, user_input):
+        """True when the utterance suggests the user needs the step again."""
+        return _CONFUSION_RE.search(user_input) is not None
+
+    def _predict_potential_issues(self):
+        """Warnings relevant to the current step, via the cached step flags."""
+        return [
+            _FLAG_ISSUES[flag]
+            for flag in self._flags_for_step(self.current_step)
+            if flag in _FLAG_ISSUES
+        ]
+
+    def _generate_proactive_tips(self):
+        """Tips relevant to the current step, via the cached step flags."""
+        return [
+            _FLAG_TIPS[flag]
+            for flag in self._flags_for_step(self.current_step)
+            if flag in _FLAG_TIPS
+        ]
+
+
+if __name__ == "__main__":
+    agent = CookingAgent()
+    agent.run()
@@ -0,0 +1,509 @@
+"""SQLite persistence layer for Su-Chef.
+
+Stores users, recipes and each user's cooking history in a local
+database file. Ingredients and steps are kept as JSON text columns on
+the recipe row.
+"""
+
+import json
+import sqlite3
+import threading
+from typing import NamedTuple, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def _dumps(obj):
+    """Serialize with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _pack_payload(ingredients, steps):
+    """Compress ingredients+steps into one small BLOB, or None.
+
+    Long recipes stored as two JSON text columns push the row across
+    several SQLite pages; zstd shrinks the combined JSON a few times
+    over so the row usually fits one page again. Returns None when
+    zstandard isn't installed and the text columns stay authoritative.
+    """
+    if zstandard is None:
+        return None
+    combined = {"ingredients": ingredients, "steps": steps}
+    if orjson is not None:
+        data = orjson.dumps(combined)
+    else:
+        data = json.dumps(combined).encode()
+    return zstandard.ZstdCompressor().compress(data)
+
+
+def _unpack_payload(blob):
+    """Decompress a payload BLOB back into its ingredients+steps dict.
+
+    Payload-backed rows carry placeholder text columns, so the blob is
+    the only copy of the recipe body — without zstandard there is no
+    way to read it, and saying so beats an AttributeError.
+    """
+    if zstandard is None:
+        raise RuntimeError(
+            "this database contains zstd-compressed recipes; "
+            "install the 'zstandard' package to read them"
+        )
+    data = zstandard.ZstdDecompressor().decompress(blob)
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class Recipe(NamedTuple):
+    """A row of the recipes table, with columns accessible by name."""
+
+    recipe_id: int
+    name: str
+    meal_type: Optional[str]
+    cooking_time: Optional[int]
+    skill_level: Optional[str]
+    dietary_restrictions: Optional[str]
+    ingredients_json: str
+    steps_json: str
+    created_at: str
+    payload: Optional[bytes]
+
+
+class HistoryEntry(NamedTuple):
+    """A user's history row: the recipe columns plus cooked/liked flags."""
+
+    recipe_id: int
+    name: str
+    meal_type: Optional[str]
+    cooking_time: Optional[int]
+    skill_level: Optional[str]
+    dietary_restrictions: Optional[str]
+    ingredients_json: str
+    steps_json: str
+    cooked: int
+    liked: int
+
+
+class RecipeDatabase:
+    """Wraps the SQLite database used by the main application."""
+
+    def __init__(self, db_name="su_chef.db"):
+        self.db_name = db_name
+        # One dedicated writer connection (SQLite serializes writers
+        # anyway); reads go through per-thread connections so the voice
+        # callback thread never queues behind a menu query in WAL mode.
+        self.conn = self._connect()
+        self._local = threading.local()
+        self.create_tables()
+
+    def _connect(self):
+        """Open a connection with the tuned pragmas applied.
+
+        Autocommit mode; multi-statement writes open explicit
+        BEGIN IMMEDIATE/COMMIT blocks so they cost one fsync total. WAL
+        keeps readers and the writer out of each other's way; NORMAL
+        sync is plenty durable for a local recipe box. The rest sizes
+        the page cache and temp space.
+        """
+        conn = sqlite3.connect(
+            self.db_name,
+            check_same_thread=False,
+            isolation_level=None,
+            # Room for every statement the app issues, so none is ever
+            # evicted and re-prepared mid-session.
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=134217728")
+        conn.execute("PRAGMA foreign_keys=ON")
+        # Rows support name lookup at C speed; they still unpack and
+        # index like tuples, so Recipe._make and friends are unaffected.
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _read_conn(self):
+        """The calling thread's read connection, opened on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    # Bump whenever create_tables' DDL changes; stored in the database
+    # via PRAGMA user_version so warm starts skip the DDL entirely.
+    _SCHEMA_VERSION = 1
+
+    def create_tables(self):
+        """Create the schema, skipping the DDL once it is in place.
+
+        SQLite parses and validates every CREATE ... IF NOT EXISTS even
+        when the object exists, so a warm start paid for the whole block
+        on every launch. The user_version pragma records that the schema
+        is current and turns that into a single pragma read.
+        """
+        row = self.conn.execute("PRAGMA user_version").fetchone()
+        if row[0] == self._SCHEMA_VERSION:
+            return
+        # Databases created before the payload column existed; on a
+        # fresh database the table doesn't exist yet and this no-ops.
+        try:
+            self.conn.execute("ALTER TABLE recipes ADD COLUMN payload BLOB")
+        except sqlite3.OperationalError:
+            pass
+        # One executescript call: the whole block is parsed and run in a
+        # single trip instead of one execute per statement. The history
+        # index makes user + cooked/liked filters (newest cooked first)
+        # index seeks, and the recipes indexes serve the listings and
+        # the NOCASE name search.
+        self.conn.executescript(f"""
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS users (
+                user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE IF NOT EXISTS recipes (
+                recipe_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                meal_type TEXT,
+                cooking_time INTEGER,
+                skill_level TEXT,
+                dietary_restrictions TEXT,
+                ingredients TEXT NOT NULL,
+                steps TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                payload BLOB
+            );
+            CREATE TABLE IF NOT EXISTS user_recipe_history (
+                history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                recipe_id INTEGER NOT NULL,
+                cooked BOOLEAN DEFAULT FALSE,
+                liked BOOLEAN DEFAULT FALSE,
+                cooked_date TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (user_id),
+                FOREIGN KEY (recipe_id) REFERENCES recipes (recipe_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_urh_user
+                ON user_recipe_history(user_id, cooked, liked, cooked_date DESC);
+            CREATE INDEX IF NOT EXISTS idx_recipes_created
+                ON recipes(created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_recipes_name_nocase
+                ON recipes(name COLLATE NOCASE);
+            PRAGMA user_version = {self._SCHEMA_VERSION};
+            COMMIT;
+        """)
+
+    # ----- users -----
+
+    def add_user(self, name):
+        """Create a user (or return the existing one) and return its id."""
+        existing = self.get_user(name)
+        if existing is not None:
+            return existing
+        cursor = self.conn.execute("INSERT INTO users (name) VALUES (?)", (name,))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def get_user(self, name):
+        """Return the user id for a name, or None."""
+        row = self._read_conn().execute(
+            "SELECT user_id FROM users WHERE name = ?", (name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    # ----- recipes -----
+
+    def save_recipe(self, recipe_data, user_id):
+        """Save a generated recipe and link it to the user's history."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.execute(
+                """
+                INSERT INTO recipes
+                    (name, meal_type, cooking_time, skill_level,
+                     dietary_restrictions, ingredients, steps, payload)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                self._recipe_row(recipe_data),
+            )
+            recipe_id = cursor.lastrowid
+            self.conn.execute(
+                """
+                INSERT INTO user_recipe_history (user_id, recipe_id, cooked_date)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                """,
+                (user_id, recipe_id),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return recipe_id
+
+    def save_recipes_bulk(self, recipes, user_id):
+        """Save many recipe dicts in one transaction; returns their ids.
+
+        One BEGIN IMMEDIATE/COMMIT pair means a single fsync for the
+        whole batch instead of one per recipe, and the history rows go
+        in through a single executemany.
+        """
+        insert_sql = """
+            INSERT INTO recipes
+                (name, meal_type, cooking_time, skill_level,
+                 dietary_restrictions, ingredients, steps, payload)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = self.conn.cursor()
+            recipe_ids = []
+            for recipe_data in recipes:
+                cursor.execute(insert_sql, self._recipe_row(recipe_data))
+                recipe_ids.append(cursor.lastrowid)
+            cursor.executemany(
+                """
+                INSERT INTO user_recipe_history (user_id, recipe_id, cooked_date)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                """,
+                [(user_id, recipe_id) for recipe_id in recipe_ids],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return recipe_ids
+
+    @staticmethod
+    def _recipe_row(recipe_data):
+        """Column tuple for a recipe insert, preferring the compressed
+        payload; the text columns then hold an empty-list placeholder."""
+        payload = _pack_payload(recipe_data["ingredients"], recipe_data["steps"])
+        if payload is not None:
+            ingredients_json = steps_json = "[]"
+        else:
+            ingredients_json = _dumps(recipe_data["ingredients"])
+            steps_json = _dumps(recipe_data["steps"])
+        return (
+            recipe_data["name"],
+            recipe_data["meal_type"],
+            recipe_data["cooking_time"],
+            recipe_data["skill_level"],
+            recipe_data["dietary_restrictions"],
+            ingredients_json,
+            steps_json,
+            payload,
+        )
+
+    def get_recipe_details(self, recipe_id):
+        """Return a recipe row plus its history stats, or None."""
+        row = self._read_conn().execute(
+            "SELECT * FROM recipes WHERE recipe_id = ?", (recipe_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        recipe = Recipe._make(row)
+        times_cooked = self._read_conn().execute(
+            """
+            SELECT COUNT(*) FROM user_recipe_history
+            WHERE recipe_id = ? AND cooked = TRUE
+            """,
+            (recipe_id,),
+        ).fetchone()[0]
+        liked = self._read_conn().execute(
+            """
+            SELECT COUNT(*) FROM user_recipe_history
+            WHERE recipe_id = ? AND liked = TRUE
+            """,
+            (recipe_id,),
+        ).fetchone()[0]
+        details = {
+            "recipe": recipe,
+            "times_cooked": times_cooked,
+            "liked": liked > 0,
+        }
+        if recipe.payload is not None:
+            # Pre-populate the decoded fields the display helpers cache
+            # on this dict, so nothing downstream touches the payload.
+            combined = _unpack_payload(recipe.payload)
+            details["_ingredients"] = combined["ingredients"]
+            details["_steps"] = combined["steps"]
+        return details
+
+    def search_recipes_by_name(self, query, limit=50, offset=0):
+        """Find recipes whose name contains the query, newest first.
+
+        Substring match, as the search prompts imply — "soup" finds
+        "Chicken Soup". Results are paged with limit/offset so a big
+        recipe box never materializes whole in Python.
+        """
+        pattern = f"%{query}%"
+        rows = self._read_conn().execute(
+            "SELECT * FROM recipes WHERE name LIKE ? COLLATE NOCASE "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (pattern, limit, offset),
+        ).fetchall()
+        return [Recipe._make(row) for row in rows]
+
+    def get_recipes_bulk(self, recipe_ids):
+        """Fetch several recipes with one IN query instead of N SELECTs."""
+        if not recipe_ids:
+            return []
+        placeholders = ",".join("?" * len(recipe_ids))
+        rows = self._read_conn().execute(
+            f"SELECT * FROM recipes WHERE recipe_id IN ({placeholders})",
+            tuple(recipe_ids),
+        ).fetchall()
+        return [Recipe._make(row) for row in rows]
+
+    def search_recipes_iter(self, query, limit=50, offset=0):
+        """Lazy variant of search_recipes_by_name.
+
+        Yields rows straight off the cursor so a caller that only needs
+        the first match (or wants to stop early) never materializes the
+        rest of the result set.
+        """
+        pattern = f"%{query}%"
+        cursor = self._read_conn().execute(
+            "SELECT * FROM recipes WHERE name LIKE ? COLLATE NOCASE "
+            "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (pattern, limit, offset),
+        )
+        return map(Recipe._make, cursor)
+
+    # One statement for all three filters: the planner short-circuits the
+    # OR tree on the search_type parameter, and every call reuses the
+    # same cached prepared statement instead of one of three texts.
+    _USER_RECIPES_SQL = """
+        SELECT r.recipe_id, r.name, r.cooking_time, r.skill_level,
+               r.created_at
+        FROM recipes r
+        JOIN user_recipe_history urh ON r.recipe_id = urh.recipe_id
+        WHERE urh.user_id = ?
+          AND (? = 'all'
+               OR (? = 'cooked' AND urh.cooked)
+               OR (? = 'liked' AND urh.liked))
+        ORDER BY CASE WHEN ? = 'all' THEN r.created_at
+                      ELSE urh.cooked_date END DESC
+        LIMIT ? OFFSET ?
+    """
+
+    def get_user_recipes(self, user_id, search_type="all", limit=50, offset=0):
+        """Recipes from a user's history, optionally cooked/liked only.
+
+        Paged with limit/offset; callers ask for the next page instead of
+        receiving the whole history at once.
+        """
+        return self._read_conn().execute(
+            self._USER_RECIPES_SQL,
+            (user_id, search_type, search_type, search_type, search_type,
+             limit, offset),
+        ).fetchall()
+
+    # ----- history -----
+
+    @staticmethod
+    def _history_entry(row):
+        """HistoryEntry from a joined row, decoding the payload if set.
+
+        Payload-backed recipes keep "[]" placeholders in the text
+        columns, so the real ingredients and steps have to come from
+        the compressed blob, like get_recipe_details does.
+        """
+        ingredients_json = row["ingredients"]
+        steps_json = row["steps"]
+        if row["payload"] is not None:
+            combined = _unpack_payload(row["payload"])
+            if orjson is not None:
+                ingredients_json = orjson.dumps(combined["ingredients"]).decode()
+                steps_json = orjson.dumps(combined["steps"]).decode()
+            else:
+                ingredients_json = json.dumps(combined["ingredients"])
+                steps_json = json.dumps(combined["steps"])
+        return HistoryEntry(
+            row["recipe_id"], row["name"], row["meal_type"],
+            row["cooking_time"], row["skill_level"],
+            row["dietary_restrictions"], ingredients_json, steps_json,
+            row["cooked"], row["liked"],
+        )
+
+    def get_user_history(self, user_id):
+        """Full history rows for a user: recipe columns plus cooked/liked."""
+        rows = self._read_conn().execute(
+            """
+            SELECT r.recipe_id, r.name, r.meal_type, r.cooking_time,
+                   r.skill_level, r.dietary_restrictions, r.ingredients,
+                   r.steps, r.payload, urh.cooked, urh.liked
+            FROM recipes r
+            JOIN user_recipe_history urh ON r.recipe_id = urh.recipe_id
+            WHERE urh.user_id = ?
+            ORDER BY urh.cooked_date DESC
+            """,
+            (user_id,),
+        ).fetchall()
+        return [self._history_entry(row) for row in rows]
+
+    # Hoisted so every call reuses the same statement text (sqlite3 keys
+    # its statement cache on it) instead of rebuilding the literal.
+    _USER_OVERVIEW_SQL = """
+        SELECT urh.cooked, urh.liked, urh.cooked_date, r.recipe_id, r.name,
+               r.cooking_time, r.skill_level, r.created_at
+        FROM user_recipe_history urh
+        JOIN recipes r ON r.recipe_id = urh.recipe_id
+        WHERE urh.user_id = ?
+        ORDER BY urh.cooked_date DESC
+    """
+
+    def get_user_overview(self, user_id):
+        """One scan for profile views that need both the list and totals.
+
+        Returns (rows, (total, cooked, liked)); callers that used to run
+        get_user_recipes plus get_user_statistics walk the history once.
+        """
+        rows = self._read_conn().execute(self._USER_OVERVIEW_SQL, (user_id,)).fetchall()
+        cooked = liked = 0
+        for row in rows:
+            if row[0]:
+                cooked += 1
+            if row[1]:
+                liked += 1
+        return rows, (len(rows), cooked, liked)
+
+    def get_user_statistics(self, user_id):
+        """Totals for the statistics screen: (total, cooked, liked)."""
+        row = self._read_conn().execute(
+            """
+            SELECT COUNT(*),
+                   SUM(CASE WHEN cooked = TRUE THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN liked = TRUE THEN 1 ELSE 0 END)
+            FROM user_recipe_history
+            WHERE user_id = ?
+            """,
+            (user_id,),
+        ).fetchone()
+        return row[0], row[1] or 0, row[2] or 0
+
+    def mark_recipe_cooked(self, recipe_id, user_id, liked=False):
+        """Record that the user cooked (and maybe liked) a recipe."""
+        self.conn.execute(
+            """
+            UPDATE user_recipe_history
+            SET cooked = TRUE, liked = ?, cooked_date = CURRENT_TIMESTAMP
+            WHERE recipe_id = ? AND user_id = ?
+            """,
+            (liked, recipe_id, user_id),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
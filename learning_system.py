@@ -0,0 +1,748 @@
+"""Adaptive learning system for Su-Chef.
+
+Tracks how each user cooks over time — questions asked, mistakes made,
+techniques practiced — and uses that history to adapt the guidance the
+voice agent gives. Profiles, sessions and raw events are persisted in
+their own SQLite database, separate from the recipe box.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+from dotenv import load_dotenv
+from openai import OpenAI
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+MODEL = "gpt-3.5-turbo"
+
+# Exported offline from the sklearn pattern classifier; when the file
+# (or onnxruntime) is missing we fall back to the API.
+PATTERN_MODEL_PATH = "learning_patterns.onnx"
+_STYLE_LABELS = ("visual", "methodical", "experimental", "cautious")
+
+# Question-intent weights; the CASE expression in _PROGRESSION_SQL
+# mirrors this table.
+_INTENT_WEIGHTS = {
+    "TECHNIQUE": 0.8,
+    "TIMING": 0.6,
+    "SUBSTITUTION": 0.7,
+    "TEMPERATURE": 0.6,
+    "CLARIFICATION": 0.3,
+}
+
+
+@lru_cache(maxsize=4096)
+def _complexity_from_intents(intents):
+    """Average weight of an intent tuple; memoized per distinct tuple."""
+    if not intents:
+        return 0.0
+    return sum(_INTENT_WEIGHTS.get(i, 0.5) for i in intents) / len(intents)
+
+
+def _dumps(obj):
+    """Serialize to JSON text, with orjson when available.
+
+    Stored as TEXT (not bytes): the JSON1 queries over these columns
+    reject BLOB input on the SQLite builds this targets.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Every keyword variant mapped to its technique, compiled into one
+# alternation so a step is scanned once in C instead of once per keyword.
+_TECHNIQUE_WORDS = {
+    "saute": "sauteing", "sauteing": "sauteing", "sauteed": "sauteing",
+    "sauté": "sauteing", "sautéing": "sauteing", "sautéed": "sauteing",
+    "chop": "chopping", "chopping": "chopping", "chopped": "chopping",
+    "dice": "dicing", "dicing": "dicing", "diced": "dicing",
+    "boil": "boiling", "boiling": "boiling", "boiled": "boiling",
+    "fry": "frying", "frying": "frying", "fried": "frying",
+    "bake": "baking", "baking": "baking", "baked": "baking",
+    "grill": "grilling", "grilling": "grilling", "grilled": "grilling",
+    "steam": "steaming", "steaming": "steaming", "steamed": "steaming",
+    "roast": "roasting", "roasting": "roasting", "roasted": "roasting",
+}
+_TECHNIQUE_RE = re.compile(
+    r"\b(?:" + "|".join(_TECHNIQUE_WORDS) + r")\b"
+)
+# Fixed technique vocabulary, in first-seen order, for the vectorized
+# batch paths that index techniques by integer id.
+_TECHNIQUES = tuple(dict.fromkeys(_TECHNIQUE_WORDS.values()))
+_TECHNIQUE_INDEX = {technique: i for i, technique in enumerate(_TECHNIQUES)}
+
+
+@dataclass(slots=True)
+class UserProfile:
+    """Everything the learning system knows about one user.
+
+    slots=True drops the per-instance __dict__ — these are allocated
+    per user per session, and attribute reads sit on the per-step
+    prediction path.
+    """
+
+    user_id: int
+    name: str = ""
+    skill_level: str = "beginner"
+    cooking_confidence: float = 0.5
+    technique_mastery: dict = field(default_factory=dict)
+    ingredient_familiarity: dict = field(default_factory=dict)
+    common_mistakes: list = field(default_factory=list)
+    question_patterns: dict = field(default_factory=dict)
+    learning_preferences: dict = field(default_factory=dict)
+    preferred_pace: str = "normal"
+    completed_recipes: int = 0
+    total_sessions: int = 0
+    last_active: str = ""
+
+    def to_dict(self):
+        """Shallow field dict for serialization.
+
+        dataclasses.asdict deep-copies every nested dict and list; the
+        save path only needs a flat view it serializes immediately.
+        """
+        return {
+            "user_id": self.user_id,
+            "name": self.name,
+            "skill_level": self.skill_level,
+            "cooking_confidence": self.cooking_confidence,
+            "technique_mastery": self.technique_mastery,
+            "ingredient_familiarity": self.ingredient_familiarity,
+            "common_mistakes": self.common_mistakes,
+            "question_patterns": self.question_patterns,
+            "learning_preferences": self.learning_preferences,
+            "preferred_pace": self.preferred_pace,
+            "completed_recipes": self.completed_recipes,
+            "total_sessions": self.total_sessions,
+            "last_active": self.last_active,
+        }
+
+
+class AdvancedLearningSystem:
+    """Builds and queries per-user learning profiles."""
+
+    # Hot statements as class attributes: sqlite3 keeps an LRU of
+    # prepared statements keyed by SQL text, so reusing the exact same
+    # string skips the re-prepare on every profile read and event write.
+    _SELECT_PROFILE_SQL = (
+        "SELECT profile_data FROM user_profiles WHERE user_id = ?"
+    )
+    _SELECT_FIELD_SQL = (
+        "SELECT json_extract(profile_data, ?) FROM user_profiles "
+        "WHERE user_id = ?"
+    )
+    _UPSERT_PROFILE_SQL = (
+        "INSERT OR REPLACE INTO user_profiles "
+        "(user_id, profile_data, last_updated) "
+        "VALUES (?, ?, CURRENT_TIMESTAMP)"
+    )
+    _INSERT_SESSION_SQL = (
+        "INSERT INTO cooking_sessions "
+        "(user_id, recipe_name, session_data, start_time_epoch) "
+        "VALUES (?, ?, ?, ?)"
+    )
+    _INSERT_EVENT_SQL = (
+        "INSERT INTO learning_events "
+        "(user_id, session_id, event_type, event_data, timestamp_epoch) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    _PROGRESSION_SQL = (
+        "SELECT s.start_time, COALESCE(AVG("
+        "  CASE WHEN q.value IS NULL THEN NULL ELSE"
+        "  CASE json_extract(q.value, '$.intent')"
+        "    WHEN 'TECHNIQUE' THEN 0.8"
+        "    WHEN 'SUBSTITUTION' THEN 0.7"
+        "    WHEN 'TIMING' THEN 0.6"
+        "    WHEN 'TEMPERATURE' THEN 0.6"
+        "    WHEN 'CLARIFICATION' THEN 0.3"
+        "    ELSE 0.5 END END), 0.0) "
+        "FROM cooking_sessions AS s "
+        "LEFT JOIN json_each(s.session_data, '$.questions') AS q "
+        "WHERE s.user_id = ? AND s.session_data IS NOT NULL "
+        "AND s.start_time_epoch > ? "
+        "GROUP BY s.session_id ORDER BY s.start_time_epoch"
+    )
+
+    def __init__(self, db_path="learning_system.db", api_key=None):
+        load_dotenv()
+        self.db_path = db_path
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        # One persistent connection for the life of the system: opening
+        # a connection per query re-paid file open, schema parse and
+        # journal setup on every profile read. Autocommit mode; writes
+        # group their statements with explicit BEGIN IMMEDIATE/COMMIT
+        # via _write_tx (sqlite3 opens no implicit transactions here).
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None,
+            cached_statements=256,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-20000")
+        self._pattern_session = None
+        self._init_database()
+
+    @contextmanager
+    def _write_tx(self):
+        """Explicit write transaction on the autocommit connection.
+
+        With isolation_level=None sqlite3 never opens implicit
+        transactions and `with self._conn:` is a no-op, so writes wrap
+        themselves in BEGIN IMMEDIATE/COMMIT — the same pattern the
+        recipe database uses.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._conn
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _init_database(self):
+        with self._write_tx():
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS user_profiles (
+                    user_id INTEGER PRIMARY KEY,
+                    profile_data TEXT NOT NULL,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cooking_sessions (
+                    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    recipe_name TEXT,
+                    start_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    start_time_epoch INTEGER,
+                    session_data TEXT
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS learning_events (
+                    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id INTEGER NOT NULL,
+                    session_id INTEGER,
+                    event_type TEXT NOT NULL,
+                    event_data TEXT,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    timestamp_epoch INTEGER
+                )
+                """
+            )
+            # Databases created before the epoch columns existed get
+            # them added and backfilled from the ISO timestamps.
+            session_cols = {
+                row[1] for row in
+                self._conn.execute("PRAGMA table_info(cooking_sessions)")
+            }
+            if "start_time_epoch" not in session_cols:
+                self._conn.execute(
+                    "ALTER TABLE cooking_sessions "
+                    "ADD COLUMN start_time_epoch INTEGER"
+                )
+                self._conn.execute(
+                    "UPDATE cooking_sessions SET start_time_epoch = "
+                    "CAST(strftime('%s', start_time) AS INTEGER)"
+                )
+            event_cols = {
+                row[1] for row in
+                self._conn.execute("PRAGMA table_info(learning_events)")
+            }
+            if "timestamp_epoch" not in event_cols:
+                self._conn.execute(
+                    "ALTER TABLE learning_events "
+                    "ADD COLUMN timestamp_epoch INTEGER"
+                )
+                self._conn.execute(
+                    "UPDATE learning_events SET timestamp_epoch = "
+                    "CAST(strftime('%s', timestamp) AS INTEGER)"
+                )
+            # The analysis queries filter on user and a recent time
+            # window, then order by time; without these composite
+            # indexes SQLite falls back to a full scan plus sort as
+            # history grows. They cover the integer epoch columns so
+            # the range comparison is a plain B-tree lookup with no
+            # per-row datetime parsing.
+            self._conn.execute("DROP INDEX IF EXISTS idx_sessions_user_time")
+            self._conn.execute("DROP INDEX IF EXISTS idx_events_user_time")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_user_epoch "
+                "ON cooking_sessions(user_id, start_time_epoch DESC)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_user_epoch "
+                "ON learning_events(user_id, timestamp_epoch DESC)"
+            )
+
+    def close(self):
+        self._conn.close()
+
+    # ----- profiles -----
+
+    def load_user_profile(self, user_id):
+        """Load a user's profile, or create a fresh one."""
+        row = self._conn.execute(
+            self._SELECT_PROFILE_SQL, (user_id,)
+        ).fetchone()
+        if row is None:
+            return UserProfile(user_id=user_id)
+        return UserProfile(**_loads(row[0]))
+
+    def load_profile_field(self, user_id, path):
+        """Read one profile field without decoding the whole profile.
+
+        path is a JSON path like "$.skill_level" or
+        "$.technique_mastery.chopping"; SQLite extracts it from the
+        stored document, so callers that need a single value skip the
+        full json.loads of a profile that keeps growing over time.
+        """
+        row = self._conn.execute(
+            self._SELECT_FIELD_SQL, (path, user_id)
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_profile_fields(self, user_id, fields):
+        """Load just the named top-level profile fields as a dict.
+
+        One SELECT extracts each field with json_extract, so callers
+        like predict_user_needs that touch three fields don't
+        materialize the whole UserProfile. Container fields come back
+        from SQLite as JSON text and are decoded here; missing users
+        get each field's dataclass default.
+        """
+        sql = "SELECT " + ", ".join(
+            ["json_extract(profile_data, ?)"] * len(fields)
+        ) + " FROM user_profiles WHERE user_id = ?"
+        row = self._conn.execute(
+            sql, tuple(f"$.{field}" for field in fields) + (user_id,)
+        ).fetchone()
+        if row is None:
+            defaults = UserProfile(user_id=user_id)
+            return {field: getattr(defaults, field) for field in fields}
+        return {
+            field: _loads(value)
+            if isinstance(value, str) and value[:1] in ("[", "{") else value
+            for field, value in zip(fields, row)
+        }
+
+    def save_user_profile(self, profile):
+        """Persist a profile, replacing any previous snapshot."""
+        # orjson serializes dataclasses natively; the stdlib path uses
+        # the shallow to_dict instead of asdict's recursive copy.
+        if orjson is not None:
+            blob = orjson.dumps(profile).decode()
+        else:
+            blob = json.dumps(profile.to_dict())
+        with self._write_tx():
+            self._conn.execute(
+                self._UPSERT_PROFILE_SQL, (profile.user_id, blob)
+            )
+
+    def import_profiles(self, profiles):
+        """Bulk-load profiles, e.g. when migrating from the prototype.
+
+        profiles is a list of UserProfile objects. They are serialized
+        as one JSON array and unpacked inside SQLite with json_each, so
+        importing a whole cohort is a single statement and transaction
+        instead of an upsert round-trip per user.
+        """
+        payload = _dumps([profile.to_dict() for profile in profiles])
+        with self._write_tx():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO user_profiles "
+                "(user_id, profile_data, last_updated) "
+                "SELECT json_extract(value, '$.user_id'), value, "
+                "CURRENT_TIMESTAMP FROM json_each(?)",
+                (payload,),
+            )
+
+    # ----- sessions and events -----
+
+    def record_session(self, user_id, recipe_name, session_data):
+        """Store one finished cooking session and return its id."""
+        with self._write_tx():
+            cursor = self._conn.execute(
+                self._INSERT_SESSION_SQL,
+                (user_id, recipe_name, _dumps(session_data),
+                 int(time.time())),
+            )
+        return cursor.lastrowid
+
+    def log_event(self, user_id, session_id, event_type, event_data=None):
+        """Record a single learning event (question, mistake, success...)."""
+        with self._write_tx():
+            self._conn.execute(
+                self._INSERT_EVENT_SQL,
+                (user_id, session_id, event_type,
+                 _dumps(event_data) if event_data is not None else None,
+                 int(time.time())),
+            )
+
+    def log_events(self, events):
+        """Record a batch of events in one transaction.
+
+        events is a list of (user_id, session_id, event_type, event_data)
+        tuples; executemany binds them against a single prepared insert
+        inside one BEGIN IMMEDIATE/COMMIT, so the whole batch is atomic
+        and costs one fsync instead of one per event.
+        """
+        now = int(time.time())
+        with self._write_tx():
+            self._conn.executemany(
+                self._INSERT_EVENT_SQL,
+                (
+                    (user_id, session_id, event_type,
+                     _dumps(event_data) if event_data is not None else None,
+                     now)
+                    for user_id, session_id, event_type, event_data in events
+                ),
+            )
+
+    def ingest_events_json(self, user_id, events_json):
+        """Bulk-load events already serialized as one JSON array.
+
+        The array is handed to SQLite whole and unpacked with json_each,
+        so a client batch lands in one statement with no per-event
+        round-trip. Each element needs "type", and optionally "sid".
+        """
+        with self._write_tx():
+            self._conn.execute(
+                "INSERT INTO learning_events "
+                "(user_id, session_id, event_type, event_data, "
+                "timestamp_epoch) "
+                "SELECT ?, json_extract(value, '$.sid'), "
+                "json_extract(value, '$.type'), value, ? "
+                "FROM json_each(?)",
+                (user_id, int(time.time()), events_json),
+            )
+
+    # ----- analysis -----
+
+    def analyze_skill_progression(self, user_id):
+        """Complexity trend of the user's questions over the last month.
+
+        Returns a list of (start_time, complexity) points, oldest first.
+        """
+        # json_each unpacks each session's question array inside SQLite,
+        # so the month of history is scored in one query instead of a
+        # json.loads per session row. The CASE weights mirror
+        # _INTENT_WEIGHTS.
+        cutoff = int(time.time()) - 30 * 86400
+        return self._conn.execute(
+            self._PROGRESSION_SQL, (user_id, cutoff)
+        ).fetchall()
+
+    def _calculate_question_complexity(self, questions):
+        """Average complexity weight of a session's questions.
+
+        Stored history is scored in SQL by analyze_skill_progression;
+        this scores live, in-memory sessions. The same question mix
+        recurs constantly within a session, so the average is memoized
+        on the tuple of intents.
+        """
+        return _complexity_from_intents(
+            tuple(question.get("intent", "") for question in questions)
+        )
+
+    def analyze_learning_patterns(self, user_id):
+        """Summarize the user's recent learning events.
+
+        Scored by the local ONNX classifier when it is available — a
+        fixed strengths/gaps/style/confidence taxonomy doesn't need a
+        chat model per user — and only escalated to the API when the
+        local model is missing or unsure about this user.
+        """
+        cutoff = int(time.time()) - 30 * 86400
+        rows = self._conn.execute(
+            "SELECT event_data FROM learning_events "
+            "WHERE user_id = ? AND timestamp_epoch > ? "
+            "ORDER BY timestamp_epoch",
+            (user_id, cutoff),
+        ).fetchall()
+
+        events = []
+        for row in rows:
+            if row[0]:
+                events.append(_loads(row[0]))
+        if not events:
+            return None
+
+        session = self._get_pattern_session()
+        if session is not None:
+            features = self._featurize_events(events)
+            probabilities = session.run(None, {"x": features})[0][0]
+            confidence = float(probabilities.max())
+            if confidence >= 0.55:
+                histogram = features[0, :len(_INTENT_WEIGHTS)]
+                mean = histogram.mean()
+                intents = tuple(_INTENT_WEIGHTS)
+                return {
+                    "strengths": [
+                        intent for intent, count in zip(intents, histogram)
+                        if count < mean
+                    ],
+                    "gaps": [
+                        intent for intent, count in zip(intents, histogram)
+                        if count > mean
+                    ],
+                    "learning_style":
+                        _STYLE_LABELS[int(probabilities.argmax())],
+                    "confidence": confidence,
+                }
+        return self._analyze_patterns_via_api(events)
+
+    def _get_pattern_session(self):
+        """Lazily load the local pattern classifier, once per instance."""
+        if self._pattern_session is None and onnxruntime is not None \
+                and os.path.exists(PATTERN_MODEL_PATH):
+            self._pattern_session = onnxruntime.InferenceSession(
+                PATTERN_MODEL_PATH
+            )
+        return self._pattern_session
+
+    @staticmethod
+    def _featurize_events(events):
+        """Events to the (1, 8) float32 vector the classifier was trained on:
+        intent histogram, mistake count, success count, event total."""
+        features = np.zeros((1, len(_INTENT_WEIGHTS) + 3), dtype=np.float32)
+        intent_index = {
+            intent: i for i, intent in enumerate(_INTENT_WEIGHTS)
+        }
+        for event in events:
+            intent = event.get("intent")
+            if intent in intent_index:
+                features[0, intent_index[intent]] += 1
+            kind = event.get("type")
+            if kind == "mistake":
+                features[0, -3] += 1
+            elif kind == "success":
+                features[0, -2] += 1
+        features[0, -1] = len(events)
+        return features
+
+    def _analyze_patterns_via_api(self, events):
+        """Fallback: ask the chat model to summarize the events."""
+        client = OpenAI(api_key=self.api_key)
+        response = client.chat.completions.create(
+            model=MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You analyze cooking-session event logs and reply "
+                        "with JSON: {\"strengths\": [], \"gaps\": [], "
+                        "\"learning_style\": \"\", \"confidence\": 0.0}"
+                    ),
+                },
+                {"role": "user", "content": json.dumps(events)},
+            ],
+            max_tokens=300,
+            temperature=0.2,
+        )
+        try:
+            return json.loads(response.choices[0].message.content)
+        except ValueError:
+            return None
+
+    # ----- knowledge extraction -----
+
+    def extract_transferable_knowledge(self, completed_recipes):
+        """Techniques the user has practiced enough to carry forward."""
+        # Counter.update runs in C over one flat stream of techniques,
+        # replacing a dict.get-and-add per occurrence in Python.
+        technique_frequency = Counter(chain.from_iterable(
+            self._extract_techniques_from_step(step)
+            for recipe in completed_recipes
+            for step in recipe.get("steps", [])
+        ))
+        return {
+            "mastered_techniques": [
+                technique
+                for technique, count in technique_frequency.items()
+                if count >= 3
+            ],
+            "technique_frequency": dict(technique_frequency),
+        }
+
+    def _extract_techniques_from_step(self, step):
+        """Set of techniques mentioned in one recipe step."""
+        return {
+            _TECHNIQUE_WORDS[match.group(0)]
+            for match in _TECHNIQUE_RE.finditer(step.lower())
+        }
+
+    def batch_technique_matrix(self, recipes):
+        """Technique counts across a whole recipe batch, vectorized.
+
+        For offline jobs over thousands of recipes the per-recipe dict
+        tallies add up; here every technique occurrence becomes one
+        (recipe_id, technique_id) pair in two flat int arrays, and
+        NumPy reduces them in C: bincount for the corpus-wide
+        frequency, add.at for the per-recipe count matrix. Returns the
+        matrix, the frequency vector (aligned with _TECHNIQUES) and the
+        mastered techniques (seen at least three times).
+        """
+        recipe_ids = []
+        technique_ids = []
+        for recipe_id, recipe in enumerate(recipes):
+            for step in recipe.get("steps", []):
+                for technique in self._extract_techniques_from_step(step):
+                    recipe_ids.append(recipe_id)
+                    technique_ids.append(_TECHNIQUE_INDEX[technique])
+
+        technique_ids = np.asarray(technique_ids, dtype=np.int16)
+        frequency = np.bincount(technique_ids, minlength=len(_TECHNIQUES))
+        matrix = np.zeros((len(recipes), len(_TECHNIQUES)), dtype=np.int16)
+        np.add.at(
+            matrix,
+            (np.asarray(recipe_ids, dtype=np.intp), technique_ids),
+            1,
+        )
+        return {
+            "techniques": _TECHNIQUES,
+            "matrix": matrix,
+            "technique_frequency": frequency,
+            "mastered_techniques": [
+                _TECHNIQUES[i] for i in np.nonzero(frequency >= 3)[0]
+            ],
+        }
+
+    # ----- guidance adaptation -----
+
+    _NEEDS_FIELDS = (
+        "technique_mastery", "common_mistakes", "ingredient_familiarity"
+    )
+
+    def prepare_recipe(self, recipe):
+        """Normalize a recipe once and cache the results on its dict.
+
+        Lowercased step text, each step's technique set and the
+        lowercased first token of every ingredient are computed on
+        first use and stored under "_steps_lower" / "_step_techniques"
+        / "_base_ingredients", the same parse-once-cache-on-the-dict
+        convention the recipe helpers use, so per-step prediction stops
+        re-lowercasing, re-splitting and re-scanning the same strings.
+        Returns the recipe for chaining.
+        """
+        if recipe.get("_steps_lower") is None:
+            steps_lower = tuple(step.lower() for step in recipe["steps"])
+            recipe["_steps_lower"] = steps_lower
+            recipe["_step_techniques"] = tuple(
+                frozenset(self._extract_techniques_from_step(step))
+                for step in steps_lower
+            )
+            recipe["_base_ingredients"] = tuple(
+                ingredient.split(None, 1)[0].lower()
+                for ingredient in recipe.get("ingredients", ())
+                if ingredient
+            )
+        return recipe
+
+    def predict_user_needs(self, profile_fields, current_recipe, current_step):
+        """Warnings and tips for the step the user is about to start.
+
+        profile_fields is the dict returned by
+        get_profile_fields(user_id, _NEEDS_FIELDS) — only the three
+        fields this prediction reads, not the whole profile.
+        """
+        predictions = []
+        self.prepare_recipe(current_recipe)
+        step_text = current_recipe["_steps_lower"][current_step]
+        step_techniques = current_recipe["_step_techniques"][current_step]
+
+        # Set intersection replaces a substring scan per known technique.
+        mastery = profile_fields["technique_mastery"]
+        for technique in mastery.keys() & step_techniques:
+            if mastery[technique] < 0.6:
+                predictions.append(
+                    f"This step uses {technique} - take it slow, "
+                    "you're still building that skill."
+                )
+
+        for mistake in profile_fields["common_mistakes"]:
+            if mistake in step_text:
+                predictions.append(
+                    f"Watch out: {mistake} has tripped you up before."
+                )
+
+        familiarity_map = profile_fields["ingredient_familiarity"]
+        for base in current_recipe["_base_ingredients"]:
+            if base in step_text and familiarity_map.get(base, 0.5) < 0.3:
+                predictions.append(
+                    f"{base} is new to you - smell and taste as you go."
+                )
+        return predictions
+
+    @staticmethod
+    def mastery_vector(technique_mastery):
+        """Mastery dict as a float32 vector over the fixed vocabulary.
+
+        Techniques the user has never touched stay 0.0, so reductions
+        measure mastery of the whole vocabulary, and vectors from many
+        users can be stacked into one matrix for cohort jobs.
+        """
+        vector = np.zeros(len(_TECHNIQUES), dtype=np.float32)
+        for technique, value in technique_mastery.items():
+            index = _TECHNIQUE_INDEX.get(technique)
+            if index is not None:
+                vector[index] = value
+        return vector
+
+    def adjust_guidance_level(self, user_profile):
+        """How much hand-holding the voice agent should give (0..1)."""
+        technique_factor = float(
+            self.mastery_vector(user_profile.technique_mastery).mean()
+        )
+        competence = (
+            0.5 * user_profile.cooking_confidence + 0.5 * technique_factor
+        )
+        return 1.0 - competence
+
+    def cohort_guidance_levels(self, profiles):
+        """Guidance levels for many users in one vectorized pass.
+
+        Stacks the profiles' mastery vectors into a 2D matrix and
+        reduces along the technique axis, instead of looping the
+        per-user sum in Python — for nightly cohort re-analysis.
+        """
+        if not profiles:
+            return []
+        matrix = np.stack([
+            self.mastery_vector(profile.technique_mastery)
+            for profile in profiles
+        ])
+        confidence = np.fromiter(
+            (profile.cooking_confidence for profile in profiles),
+            dtype=np.float32, count=len(profiles),
+        )
+        levels = 1.0 - (0.5 * confidence + 0.5 * matrix.mean(axis=1))
+        return levels.tolist()
@@ -0,0 +1,557 @@
+"""Recipe generation for Su-Chef.
+
+Talks to the OpenAI API to generate recipes, parses the model's response
+into structured data, and keeps a small on-disk semantic cache so that
+repeated (or near-duplicate) requests are served locally instead of
+paying for another API round-trip.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import sys
+
+import numpy as np
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI, RateLimitError
+
+MODEL = "gpt-3.5-turbo"
+EMBEDDING_MODEL = "text-embedding-3-small"
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+CACHE_DB = "recipe_cache.db"
+# Cached generations older than this are dropped on startup; recipes
+# don't go stale quickly, but an unbounded cache file would.
+CACHE_TTL_DAYS = 30
+
+SIMILARITY_THRESHOLD = 0.92
+
+# Role plus the full output rubric live in the system message, so the
+# byte-identical prefix of every request is as long as possible and the
+# provider's prompt caching can skip re-prefilling it; user messages
+# carry only the per-request slots.
+_SYSTEM_PROMPT = (
+    "You are a helpful cooking assistant.\n"
+    "\nFormat your response exactly like this:\n"
+    "Recipe Name: [name]\n"
+    "Ingredients:\n"
+    "- [ingredient]\n"
+    "Instructions:\n"
+    "1. [step]"
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _client(api_key):
+    """One OpenAI client per key, so the TLS/keep-alive pool is reused
+    across calls instead of being rebuilt per request."""
+    return OpenAI(api_key=api_key)
+
+
+_cache_conn = None
+
+
+def _get_cache_conn():
+    """Open (once) the SQLite database backing the semantic cache."""
+    global _cache_conn
+    if _cache_conn is None:
+        _cache_conn = sqlite3.connect(CACHE_DB)
+        _cache_conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS recipe_cache (
+                prompt_hash TEXT PRIMARY KEY,
+                embedding BLOB,
+                recipe_json TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        _cache_conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pending_batches (
+                batch_id TEXT PRIMARY KEY,
+                submitted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # TTL sweep, once per process: expired entries never reach the
+        # lookup queries and the cache file stays bounded.
+        _cache_conn.execute(
+            "DELETE FROM recipe_cache WHERE created_at < datetime('now', ?)",
+            (f"-{CACHE_TTL_DAYS} days",),
+        )
+        _cache_conn.commit()
+    return _cache_conn
+
+
+def normalize_prompt_key(prompt, params=()):
+    """Build the cache key text: structured parameters plus the prompt.
+
+    Including the parameter tuple (meal type, time bucket, skill level,
+    dietary restrictions, sorted ingredients) keeps semantically close
+    prompts for *different* meal types from colliding.
+    """
+    parts = [str(p).strip().lower() for p in params]
+    parts.append(" ".join(prompt.split()).lower())
+    return "|".join(parts)
+
+
+_local_embedder = None
+
+
+def _get_local_embedder():
+    """Load the small on-device embedding model once, when available."""
+    global _local_embedder
+    if _local_embedder is None and SentenceTransformer is not None:
+        _local_embedder = SentenceTransformer(LOCAL_EMBEDDING_MODEL)
+    return _local_embedder
+
+
+def _embed(client, text):
+    """Embed cache-key text, preferring the local model.
+
+    A cache probe that itself calls the OpenAI embeddings endpoint pays
+    an API round-trip per lookup; MiniLM runs in a few milliseconds on
+    CPU and keeps lookups fully offline. The OpenAI endpoint remains as
+    a fallback when sentence-transformers isn't installed.
+    """
+    model = _get_local_embedder()
+    if model is not None:
+        return model.encode(text, normalize_embeddings=True).astype(np.float32)
+    response = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    return np.asarray(response.data[0].embedding, dtype=np.float32)
+
+
+def semantic_cache_lookup(client, prompt, params=()):
+    """Look up a cached recipe for this prompt.
+
+    Returns (prompt_hash, embedding, recipe_text). recipe_text is None on
+    a miss; embedding is None when the exact-hash check already hit.
+    """
+    key = normalize_prompt_key(prompt, params)
+    prompt_hash = hashlib.sha256(key.encode()).hexdigest()
+    conn = _get_cache_conn()
+
+    row = conn.execute(
+        "SELECT recipe_json FROM recipe_cache WHERE prompt_hash = ?",
+        (prompt_hash,),
+    ).fetchone()
+    if row:
+        return prompt_hash, None, row[0]
+
+    # Exact miss: fall back to embedding similarity against cached prompts.
+    embedding = _embed(client, key)
+    rows = conn.execute(
+        "SELECT embedding, recipe_json FROM recipe_cache WHERE embedding IS NOT NULL"
+    ).fetchall()
+    # Entries cached under a different embedding model have a different
+    # dimensionality; only compare against compatible vectors.
+    rows = [r for r in rows if len(r[0]) == embedding.nbytes]
+    if rows:
+        matrix = np.frombuffer(
+            b"".join(r[0] for r in rows), dtype=np.float32
+        ).reshape(len(rows), -1)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(embedding)
+        similarities = matrix @ embedding / np.maximum(norms, 1e-10)
+        best = int(np.argmax(similarities))
+        if similarities[best] > SIMILARITY_THRESHOLD:
+            return prompt_hash, embedding, rows[best][1]
+
+    return prompt_hash, embedding, None
+
+
+def semantic_cache_store(prompt_hash, embedding, recipe_text):
+    """Record a successful generation in the cache."""
+    conn = _get_cache_conn()
+    conn.execute(
+        "INSERT OR REPLACE INTO recipe_cache (prompt_hash, embedding, recipe_json) "
+        "VALUES (?, ?, ?)",
+        (prompt_hash, embedding.tobytes() if embedding is not None else None, recipe_text),
+    )
+    conn.commit()
+
+
+def _max_tokens_for(prompt):
+    """Budget the completion by prompt size: short asks get short answers."""
+    return 600 if len(prompt) < 400 else 800
+
+
+def get_recipe_from_openai(prompt, api_key, cache_params=(), fresh=False):
+    """Generate a recipe, consulting the semantic cache first.
+
+    On a cache miss the response is streamed: tokens are printed as they
+    arrive so the user sees the recipe grow instead of a blank screen,
+    and the accumulated text is returned (and cached) at the end.
+
+    fresh=True skips the cache lookup entirely — a "give me a different
+    recipe" retry differs from the rejected attempt by barely a
+    character, so the similarity fallback would keep returning the very
+    recipe the user just turned down. The result is still stored, but
+    without an embedding, so retries never become similarity candidates
+    either.
+    """
+    client = _client(api_key)
+
+    if fresh:
+        key = normalize_prompt_key(prompt, cache_params)
+        prompt_hash = hashlib.sha256(key.encode()).hexdigest()
+        embedding = None
+    else:
+        try:
+            prompt_hash, embedding, cached = semantic_cache_lookup(
+                client, prompt, cache_params
+            )
+        except Exception as e:
+            print(f"⚠️  Recipe cache unavailable: {e}")
+            prompt_hash = embedding = cached = None
+        if cached is not None:
+            print(cached)
+            return cached
+
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=_max_tokens_for(prompt),
+        temperature=0.7,
+        stream=True,
+    )
+    parts = []
+    for chunk in response:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            sys.stdout.write(delta)
+            sys.stdout.flush()
+            parts.append(delta)
+    sys.stdout.write("\n")
+    recipe_text = "".join(parts)
+
+    if prompt_hash is not None:
+        try:
+            semantic_cache_store(prompt_hash, embedding, recipe_text)
+        except Exception as e:
+            print(f"⚠️  Could not cache recipe: {e}")
+    return recipe_text
+
+
+async def get_recipes_batch(prompts, api_key, max_concurrent=8):
+    """Generate several recipes concurrently.
+
+    Each prompt costs roughly the same network-bound latency, so firing
+    them together takes about as long as one. Concurrency is capped by a
+    semaphore and 429s are retried with exponential backoff.
+    """
+    client = AsyncOpenAI(api_key=api_key)
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def generate_one(prompt):
+        async with semaphore:
+            for attempt in range(5):
+                try:
+                    response = await client.chat.completions.create(
+                        model=MODEL,
+                        messages=[
+                            {"role": "system", "content": _SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt},
+                        ],
+                        max_tokens=_max_tokens_for(prompt),
+                        temperature=0.7,
+                    )
+                    return response.choices[0].message.content
+                except RateLimitError:
+                    if attempt == 4:
+                        raise
+                    await asyncio.sleep(2 ** attempt + random.random())
+
+    return await asyncio.gather(*(generate_one(p) for p in prompts))
+
+
+def submit_recipe_batch(prompts, api_key):
+    """Submit prompts through the OpenAI Batch API.
+
+    Batched requests cost half the synchronous price and bypass the
+    per-minute rate limits, with results ready within 24 hours — a good
+    fit for offline meal planning. Returns the batch id, which is also
+    recorded in pending_batches for later polling.
+    """
+    client = _client(api_key)
+    lines = [
+        json.dumps(
+            {
+                "custom_id": f"recipe-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": MODEL,
+                    "messages": [
+                        {"role": "system", "content": _SYSTEM_PROMPT},
+                        {"role": "user", "content": prompt},
+                    ],
+                    "max_tokens": 800,
+                    "temperature": 0.7,
+                },
+            }
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+    payload = ("\n".join(lines) + "\n").encode()
+    batch_file = client.files.create(
+        file=("recipe_batch.jsonl", payload), purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+
+    conn = _get_cache_conn()
+    conn.execute(
+        "INSERT OR IGNORE INTO pending_batches (batch_id) VALUES (?)", (batch.id,)
+    )
+    conn.commit()
+    return batch.id
+
+
+def check_batches(api_key):
+    """Poll pending batches and collect finished recipe texts."""
+    client = _client(api_key)
+    conn = _get_cache_conn()
+    recipe_texts = []
+
+    for (batch_id,) in conn.execute("SELECT batch_id FROM pending_batches").fetchall():
+        batch = client.batches.retrieve(batch_id)
+        print(f"Batch {batch_id}: {batch.status}")
+        if batch.status == "completed":
+            content = client.files.content(batch.output_file_id).text
+            for line in content.splitlines():
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                recipe_texts.append(
+                    result["response"]["body"]["choices"][0]["message"]["content"]
+                )
+            conn.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
+            conn.commit()
+        elif batch.status in ("failed", "expired", "cancelled"):
+            conn.execute("DELETE FROM pending_batches WHERE batch_id = ?", (batch_id,))
+            conn.commit()
+
+    return recipe_texts
+
+
+# Matches numbered or bulleted list items; the capture group strips the
+# marker so no lstrip cleanup is needed.
+_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-•])\s*(.+)$")
+
+# Section-header dispatch for the response parser.
+_SECTION_KEYS = {
+    "recipe name": "name",
+    "ingredients": "ingredients",
+    "steps": "steps",
+    "instructions": "steps",
+}
+
+
+def process_recipe(recipe_text, meal_type, cooking_time, skill_level, dietary_restrictions):
+    """Parse the model's recipe text into a structured dict.
+
+    Single pass: each line is split once with partition(':'), headers are
+    resolved through a dict, and everything else goes through one item
+    regex — no repeated splits or membership chains per line.
+    """
+    name = "AI Generated Recipe"
+    sections = {"ingredients": [], "steps": []}
+    current = None
+
+    for line in recipe_text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        head, sep, tail = line.partition(":")
+        if sep:
+            key = _SECTION_KEYS.get(head.strip().lower())
+            if key == "name":
+                if tail.strip():
+                    name = tail.strip()
+                current = None
+                continue
+            if key is not None:
+                current = sections[key]
+                continue
+        if current is not None:
+            item = _ITEM_RE.match(line)
+            if item:
+                current.append(item.group(1).strip())
+
+    ingredients = sections["ingredients"]
+    steps = sections["steps"]
+    return {
+        "name": name,
+        "meal_type": meal_type,
+        "cooking_time": cooking_time,
+        "skill_level": skill_level,
+        "dietary_restrictions": dietary_restrictions,
+        "ingredients": ingredients,
+        "steps": steps,
+    }
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_completion(api_key, prompt):
+    """One chat completion per unique prompt; repeats within a session
+    are served from memory instead of paying for another API call."""
+    client = _client(api_key)
+    response = client.chat.completions.create(
+        model=MODEL,
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=800,
+        temperature=0.7,
+    )
+    return response.choices[0].message.content
+
+
+# Classifies every line of a formatted response in one C-level scan:
+# the alternation tags each line as name, section header, ingredient or
+# numbered step via named groups.
+_RESPONSE_LINE_RE = re.compile(
+    r"^[ \t]*(?:"
+    r"Recipe Name:\s*(?P<name>.+?)"
+    r"|(?P<ing_hdr>Ingredients:)"
+    r"|(?P<step_hdr>Instructions:)"
+    r"|-\s*(?P<ing>.+?)"
+    r"|\d+[.)]\s*(?P<step>.+?)"
+    r")\s*$",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_recipe_cached(recipe_text):
+    """Parse a formatted recipe response; deterministic, so memoized."""
+    name = "Generated Recipe"
+    ingredients = []
+    steps = []
+
+    for m in _RESPONSE_LINE_RE.finditer(recipe_text):
+        if m.group("name"):
+            name = m.group("name")
+        elif m.group("ing"):
+            ingredients.append(m.group("ing"))
+        elif m.group("step"):
+            steps.append(m.group("step"))
+
+    return {"name": name, "ingredients": ingredients, "steps": steps}
+
+
+class RecipeGenerator:
+    """Object-style wrapper around recipe generation and parsing."""
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+
+    def _build_prompt(self, meal_type, cooking_time, skill_level,
+                      dietary_restrictions=None, available_ingredients=None):
+        # Fragments joined once; the output rubric lives in the system
+        # message, so the user prompt is just the per-request slots.
+        parts = [
+            f"Create a {meal_type} recipe that:",
+            f"- Takes {cooking_time} minutes or less to prepare",
+            f"- Is suitable for a {skill_level} cook",
+        ]
+        if dietary_restrictions:
+            parts.append(f"- Is {dietary_restrictions}")
+        if available_ingredients:
+            parts.append(
+                "- Uses these ingredients: " + ", ".join(available_ingredients)
+            )
+        return "\n".join(parts)
+
+    def generate_recipe(self, meal_type, cooking_time, skill_level,
+                        dietary_restrictions=None, available_ingredients=None):
+        """Generate and parse one recipe for the given constraints."""
+        # Normalized ingredient order so reordered input still hits the
+        # completion cache.
+        ingredients = tuple(sorted(i.lower() for i in available_ingredients or ()))
+        prompt = self._build_prompt(
+            meal_type, cooking_time, skill_level,
+            dietary_restrictions, ingredients,
+        )
+        return self.parse_recipe(_cached_completion(self.api_key, prompt))
+
+    def parse_recipe(self, recipe_text):
+        """Parse a formatted recipe response into name/ingredients/steps.
+
+        Returns a fresh dict with fresh lists: the memoized parse is
+        shared across calls, and handing callers the cached object
+        would let any mutation (extra keys, appended items) corrupt it
+        for everyone else.
+        """
+        cached = _parse_recipe_cached(recipe_text)
+        return {
+            "name": cached["name"],
+            "ingredients": list(cached["ingredients"]),
+            "steps": list(cached["steps"]),
+        }
+
+
+def main():
+    """Small interactive loop for generating recipes from the terminal."""
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("Set OPENAI_API_KEY in your .env file first.")
+        return
+
+    print("🍳 Su-Chef Recipe Generator")
+    meal_type = input("What meal would you like? (breakfast/lunch/dinner): ").strip()
+    cooking_time = input("How many minutes do you have? ").strip()
+    skill_level = input("Your skill level? (beginner/intermediate/advanced): ").strip()
+    dietary = input("Any dietary restrictions? (press enter to skip): ").strip()
+    ingredients_input = input("Ingredients on hand? (comma separated, enter to skip): ").strip()
+    ingredients = [i.strip() for i in ingredients_input.split(",") if i.strip()]
+
+    # Build the prompt as a list of lines and join once; no intermediate
+    # strings, and no stray whitespace to waste prompt tokens on.
+    parts = [
+        f"Create a {meal_type} recipe that:",
+        f"- Takes {cooking_time} minutes or less to prepare",
+        f"- Is suitable for a {skill_level} cook",
+    ]
+    if dietary:
+        parts.append(f"- Is {dietary}")
+    if ingredients:
+        parts.append("- Uses these ingredients: " + ", ".join(ingredients))
+    prompt = "\n".join(parts)
+
+    cache_params = (
+        meal_type,
+        cooking_time,
+        skill_level,
+        dietary,
+        ",".join(sorted(i.lower() for i in ingredients)),
+    )
+    print("\n🤖 Generating your recipe...\n")
+    recipe_text = get_recipe_from_openai(prompt, api_key, cache_params)
+
+    recipe = process_recipe(recipe_text, meal_type, cooking_time, skill_level, dietary)
+    print(f"\n✅ Parsed '{recipe['name']}' with {len(recipe['ingredients'])} "
+          f"ingredients and {len(recipe['steps'])} steps.")
+
+
+if __name__ == "__main__":
+    main()
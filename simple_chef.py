@@ -0,0 +1,812 @@
+"""Simple all-in-one Su-Chef prototype.
+
+A single-file version of the assistant: manage recipes in a local SQLite
+database, generate new ones with OpenAI, and cook hands-free with Azure
+voice guidance.
+"""
+
+import hashlib
+import io
+import json
+import os
+import queue
+import re
+import sqlite3
+import sys
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# openai, azure.cognitiveservices.speech and recipe_generator (which pulls
+# in both) are imported lazily inside the methods that need them: they are
+# by far the heaviest imports here, and someone just browsing saved
+# recipes shouldn't pay their startup cost.
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+
+TTS_CACHE_DIR = "tts_cache"
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _tts_cache_path(text):
+    return os.path.join(
+        TTS_CACHE_DIR, hashlib.sha256(text.encode()).hexdigest() + ".wav"
+    )
+
+
+def _tts_cache_load(text):
+    """Return cached WAV bytes for this text, or None."""
+    path = _tts_cache_path(text)
+    try:
+        with open(path, "rb") as f:
+            audio_data = f.read()
+        os.utime(path)  # refresh for LRU eviction
+        return audio_data
+    except OSError:
+        return None
+
+
+def _tts_cache_store(text, audio_data):
+    """Cache synthesized audio, evicting least-recently-used files."""
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        with open(_tts_cache_path(text), "wb") as f:
+            f.write(audio_data)
+        entries = []
+        for name in os.listdir(TTS_CACHE_DIR):
+            path = os.path.join(TTS_CACHE_DIR, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= TTS_CACHE_MAX_BYTES:
+                break
+            os.remove(path)
+            total -= size
+    except OSError:
+        pass
+
+
+def _play_wav_bytes(audio_data):
+    """Play synthesized WAV bytes locally. Returns False when unavailable."""
+    if simpleaudio is None:
+        return False
+    with wave.open(io.BytesIO(audio_data)) as w:
+        playback = simpleaudio.play_buffer(
+            w.readframes(w.getnframes()),
+            w.getnchannels(),
+            w.getsampwidth(),
+            w.getframerate(),
+        )
+    playback.wait_done()
+    return True
+
+
+def _dumps(obj):
+    """Serialize with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    """Deserialize with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Compiled once so the AI-response parser classifies each line with two
+# C-level regex matches instead of a chain of string scans.
+_SECTION_RE = re.compile(
+    r"^(recipe name|ingredients|steps|instructions)\s*:\s*(.*)$", re.IGNORECASE
+)
+_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]|[-•])\s*(.+)$")
+
+
+class SimpleSuChef:
+    """Menu-driven kitchen assistant backed by a local SQLite database."""
+
+    def __init__(self):
+        load_dotenv()
+        self.openai_key = os.getenv("OPENAI_API_KEY")
+        self.speech_key = os.getenv("AZURE_SPEECH_KEY")
+        self.speech_region = os.getenv("AZURE_SPEECH_REGION", "eastus")
+        self._openai_client = None
+        self._speechsdk = None
+        self.current_recipe = None
+        self.setup_database()
+
+    def _get_openai_client(self):
+        """Build the OpenAI client once and keep its connection pool warm.
+
+        The openai package is imported here, on first use, rather than at
+        module load.
+        """
+        if self._openai_client is None:
+            from openai import OpenAI
+
+            self._openai_client = OpenAI(api_key=self.openai_key)
+        return self._openai_client
+
+    def _get_speechsdk(self):
+        """Import the Azure Speech SDK on first use and cache the module."""
+        if self._speechsdk is None:
+            import azure.cognitiveservices.speech as speechsdk
+
+            self._speechsdk = speechsdk
+        return self._speechsdk
+
+    def setup_database(self):
+        """Create the recipes table if this is the first run."""
+        # Autocommit connection; writes that need atomicity open explicit
+        # BEGIN/COMMIT blocks themselves.
+        self.conn = sqlite3.connect(
+            "simple_recipes.db", check_same_thread=False, isolation_level=None
+        )
+        # Name-based column access without tuple unpacking at call sites.
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets reads run alongside writes and batches fsyncs;
+        # synchronous=NORMAL is plenty durable for a local recipe box.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS recipes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                ingredients TEXT NOT NULL,
+                steps TEXT NOT NULL,
+                preview TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        # Databases created before the preview column existed.
+        try:
+            self.conn.execute("ALTER TABLE recipes ADD COLUMN preview TEXT")
+        except sqlite3.OperationalError:
+            pass
+        # Keep the hot lookups (newest-first listing, name search) on
+        # index seeks instead of full table scans as the library grows.
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_recipes_created_at "
+            "ON recipes(created_at DESC)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_recipes_name "
+            "ON recipes(name COLLATE NOCASE)"
+        )
+        # Full-text index over name/ingredients/steps, kept in sync with
+        # triggers, so search covers the whole recipe with BM25 ranking.
+        fts_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+            "AND name = 'recipes_fts'"
+        ).fetchone() is not None
+        try:
+            self.conn.executescript(
+                """
+                CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+                    name, ingredients, steps,
+                    content='recipes', content_rowid='id',
+                    tokenize='porter unicode61'
+                );
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_insert
+                AFTER INSERT ON recipes BEGIN
+                    INSERT INTO recipes_fts(rowid, name, ingredients, steps)
+                    VALUES (new.id, new.name, new.ingredients, new.steps);
+                END;
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_delete
+                AFTER DELETE ON recipes BEGIN
+                    INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients, steps)
+                    VALUES ('delete', old.id, old.name, old.ingredients, old.steps);
+                END;
+                CREATE TRIGGER IF NOT EXISTS recipes_fts_update
+                AFTER UPDATE ON recipes BEGIN
+                    INSERT INTO recipes_fts(recipes_fts, rowid, name, ingredients, steps)
+                    VALUES ('delete', old.id, old.name, old.ingredients, old.steps);
+                    INSERT INTO recipes_fts(rowid, name, ingredients, steps)
+                    VALUES (new.id, new.name, new.ingredients, new.steps);
+                END;
+                """
+            )
+            if not fts_exists:
+                # The triggers only cover rows written after the table
+                # exists; index whatever a legacy database already holds.
+                self.conn.execute(
+                    "INSERT INTO recipes_fts(recipes_fts) VALUES('rebuild')"
+                )
+            self.fts_enabled = True
+        except sqlite3.OperationalError:
+            self.fts_enabled = False
+        self.conn.commit()
+
+    # ----- recipe creation -----
+
+    def create_recipe(self):
+        """Manually enter a recipe."""
+        print("\n📝 Let's add a recipe!")
+        name = input("Recipe name: ").strip()
+        if not name:
+            print("A recipe needs a name.")
+            return
+
+        ingredients = []
+        print("Enter ingredients one per line (empty line to finish):")
+        while True:
+            ingredient = input("- ").strip()
+            if not ingredient:
+                break
+            ingredients.append(ingredient)
+
+        steps = []
+        print("Enter steps one per line (empty line to finish):")
+        while True:
+            step = input(f"{len(steps) + 1}. ").strip()
+            if not step:
+                break
+            steps.append(step)
+
+        self.save_recipe(name, ingredients, steps)
+        print(f"✅ Saved '{name}'!")
+
+    def generate_ai_recipe(self):
+        """Generate a recipe with OpenAI and offer to save it."""
+        if not self.openai_key:
+            print("OpenAI isn't set up. Add OPENAI_API_KEY to your .env file.")
+            return
+
+        print("\n🤖 Let's generate a recipe!")
+        meal_type = input("What meal? (breakfast/lunch/dinner/snack): ").strip()
+        cooking_time = input("How many minutes do you have? ").strip()
+        skill_level = input("Skill level? (beginner/intermediate/advanced): ").strip()
+        dietary = input("Dietary restrictions? (enter to skip): ").strip()
+        ingredients_input = input("Ingredients to use? (comma separated, enter to skip): ").strip()
+        ingredients = [i.strip() for i in ingredients_input.split(",") if i.strip()]
+
+        prompt = f"Create a {meal_type} recipe that:\n"
+        prompt += f"- Takes {cooking_time} minutes or less to prepare\n"
+        prompt += f"- Is suitable for a {skill_level} cook\n"
+        if dietary:
+            prompt += f"- Is {dietary}\n"
+        if ingredients:
+            prompt += "- Uses these ingredients: " + ", ".join(ingredients) + "\n"
+        prompt += (
+            "\nFormat your response exactly like this:\n"
+            "Recipe Name: [name]\n"
+            "Ingredients:\n"
+            "- [ingredient]\n"
+            "Instructions:\n"
+            "1. [step]\n"
+        )
+
+        from recipe_generator import semantic_cache_lookup, semantic_cache_store
+
+        client = self._get_openai_client()
+        cache_params = (
+            meal_type,
+            cooking_time,
+            skill_level,
+            dietary,
+            ",".join(sorted(i.lower() for i in ingredients)),
+        )
+        try:
+            prompt_hash, embedding, cached = semantic_cache_lookup(
+                client, prompt, cache_params
+            )
+        except Exception as e:
+            print(f"⚠️  Recipe cache unavailable: {e}")
+            prompt_hash = embedding = cached = None
+
+        print("\n🧑‍🍳 Generating...\n")
+        if cached is not None:
+            recipe_text = cached
+            print(recipe_text)
+        else:
+            try:
+                response = client.chat.completions.create(
+                    model="gpt-3.5-turbo",
+                    messages=[
+                        {"role": "system", "content": "You are a helpful cooking assistant."},
+                        {"role": "user", "content": prompt},
+                    ],
+                    max_tokens=800,
+                    temperature=0.7,
+                    stream=True,
+                )
+                # Print tokens as they arrive so the user isn't staring at
+                # a blank screen for the whole completion.
+                parts = []
+                for chunk in response:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        sys.stdout.write(delta)
+                        sys.stdout.flush()
+                        parts.append(delta)
+                sys.stdout.write("\n")
+            except Exception as e:
+                print(f"❌ Generation failed: {e}")
+                return
+            recipe_text = "".join(parts)
+            if prompt_hash is not None:
+                try:
+                    semantic_cache_store(prompt_hash, embedding, recipe_text)
+                except Exception as e:
+                    print(f"⚠️  Could not cache recipe: {e}")
+
+        if input("\nSave this recipe? (y/n): ").strip().lower() == "y":
+            self.parse_and_save_ai_recipe(recipe_text)
+
+    def generate_ai_variations(self):
+        """Generate several takes on one request concurrently."""
+        if not self.openai_key:
+            print("OpenAI isn't set up. Add OPENAI_API_KEY to your .env file.")
+            return
+
+        print("\n🤖 Let's generate some options!")
+        meal_type = input("What meal? (breakfast/lunch/dinner/snack): ").strip()
+        cooking_time = input("How many minutes do you have? ").strip()
+        skill_level = input("Skill level? (beginner/intermediate/advanced): ").strip()
+        dietary = input("Dietary restrictions? (enter to skip): ").strip()
+        count_input = input("How many variations? (2-5): ").strip()
+        count = int(count_input) if count_input.isdigit() else 3
+        count = max(2, min(count, 5))
+
+        base_prompt = f"Create a {meal_type} recipe that:\n"
+        base_prompt += f"- Takes {cooking_time} minutes or less to prepare\n"
+        base_prompt += f"- Is suitable for a {skill_level} cook\n"
+        if dietary:
+            base_prompt += f"- Is {dietary}\n"
+        base_prompt += (
+            "\nFormat your response exactly like this:\n"
+            "Recipe Name: [name]\n"
+            "Ingredients:\n"
+            "- [ingredient]\n"
+            "Instructions:\n"
+            "1. [step]\n"
+        )
+        print(f"\n🧑‍🍳 Generating {count} variations...\n")
+        # One request with n=count: the prompt is prefilled once and the
+        # API decodes k independent completions, so input tokens are paid
+        # for a single prompt instead of k.
+        try:
+            response = self._get_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[
+                    {"role": "system", "content": "You are a helpful cooking assistant."},
+                    {"role": "user", "content": base_prompt},
+                ],
+                max_tokens=800,
+                temperature=0.7,
+                n=count,
+            )
+        except Exception as e:
+            print(f"❌ Generation failed: {e}")
+            return
+        recipe_texts = [choice.message.content for choice in response.choices]
+
+        for i, recipe_text in enumerate(recipe_texts, 1):
+            print(f"\n===== Option {i} =====")
+            print(recipe_text)
+            if input(f"\nSave option {i}? (y/n): ").strip().lower() == "y":
+                self.parse_and_save_ai_recipe(recipe_text)
+
+    def submit_meal_plan_batch(self):
+        """Queue a week's worth of recipes through the cheaper Batch API."""
+        if not self.openai_key:
+            print("OpenAI isn't set up. Add OPENAI_API_KEY to your .env file.")
+            return
+
+        print("\n📅 Bulk meal planning (results arrive within 24 hours, half price).")
+        print("Describe each meal you want, one per line (empty line to finish):")
+        prompts = []
+        while True:
+            description = input("- ").strip()
+            if not description:
+                break
+            prompts.append(
+                f"Create a recipe for: {description}\n"
+                "\nFormat your response exactly like this:\n"
+                "Recipe Name: [name]\n"
+                "Ingredients:\n"
+                "- [ingredient]\n"
+                "Instructions:\n"
+                "1. [step]\n"
+            )
+        if not prompts:
+            return
+
+        from recipe_generator import submit_recipe_batch
+
+        try:
+            batch_id = submit_recipe_batch(prompts, self.openai_key)
+        except Exception as e:
+            print(f"❌ Could not submit batch: {e}")
+            return
+        print(f"✅ Submitted {len(prompts)} recipes as batch {batch_id}. "
+              "Check back later from the menu.")
+
+    def check_batch_results(self):
+        """Poll pending batches and offer to save any finished recipes."""
+        if not self.openai_key:
+            print("OpenAI isn't set up. Add OPENAI_API_KEY to your .env file.")
+            return
+
+        from recipe_generator import check_batches
+
+        try:
+            recipe_texts = check_batches(self.openai_key)
+        except Exception as e:
+            print(f"❌ Could not check batches: {e}")
+            return
+        if not recipe_texts:
+            print("No finished batches yet.")
+            return
+
+        to_save = []
+        for i, recipe_text in enumerate(recipe_texts, 1):
+            print(f"\n===== Batch recipe {i} =====")
+            print(recipe_text)
+            if input(f"\nSave recipe {i}? (y/n): ").strip().lower() == "y":
+                to_save.append(self._parse_ai_recipe(recipe_text))
+        if to_save:
+            self.save_recipes_bulk(to_save)
+            print(f"✅ Saved {len(to_save)} recipes.")
+
+    def parse_and_save_ai_recipe(self, recipe_text):
+        """Parse the AI's formatted response and save it."""
+        name, ingredients, steps = self._parse_ai_recipe(recipe_text)
+        self.save_recipe(name, ingredients, steps)
+        print(f"✅ Saved '{name}'!")
+
+    def _parse_ai_recipe(self, recipe_text):
+        """Parse the AI's formatted response into (name, ingredients, steps)."""
+        name = "AI Generated Recipe"
+        ingredients = []
+        steps = []
+        current_section = None
+
+        for line in recipe_text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            header = _SECTION_RE.match(line)
+            if header:
+                section = header.group(1).lower()
+                if section == "recipe name":
+                    if header.group(2):
+                        name = header.group(2).strip()
+                    current_section = None
+                elif section == "ingredients":
+                    current_section = "ingredients"
+                else:
+                    current_section = "steps"
+                continue
+            item = _ITEM_RE.match(line)
+            if item:
+                if current_section == "ingredients":
+                    ingredients.append(item.group(1).strip())
+                elif current_section == "steps":
+                    steps.append(item.group(1).strip())
+
+        return name, ingredients, steps
+
+    _INSERT_RECIPE_SQL = (
+        "INSERT INTO recipes (name, ingredients, steps, preview) VALUES (?, ?, ?, ?)"
+    )
+
+    @staticmethod
+    def _preview(ingredients):
+        """Short listing blurb so browsing never touches the JSON blobs."""
+        return ", ".join(ingredients[:3])
+
+    def save_recipe(self, name, ingredients, steps):
+        self.conn.execute(
+            self._INSERT_RECIPE_SQL,
+            (name, _dumps(ingredients), _dumps(steps), self._preview(ingredients)),
+        )
+        self.conn.commit()
+
+    def save_recipes_bulk(self, recipes):
+        """Save many (name, ingredients, steps) triples in one transaction.
+
+        executemany reuses the prepared insert and the single COMMIT means
+        one fsync for the whole batch instead of one per recipe.
+        """
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(
+                self._INSERT_RECIPE_SQL,
+                [(n, _dumps(i), _dumps(s), self._preview(i)) for n, i, s in recipes],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    # ----- browsing -----
+
+    PAGE_SIZE = 20
+
+    def view_recipes(self):
+        """List saved recipes a page at a time, optionally showing one in full."""
+        page = 0
+        while True:
+            # Only hot columns, one page per query: ORDER BY rides the
+            # created_at index, so SQLite stops after LIMIT rows instead
+            # of sorting the whole table.
+            rows = self.conn.execute(
+                "SELECT id, name, preview, created_at FROM recipes "
+                "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (self.PAGE_SIZE, page * self.PAGE_SIZE),
+            ).fetchall()
+            if not rows and page == 0:
+                print("\nNo recipes saved yet.")
+                return
+            if not rows:
+                print("\nNo more recipes.")
+                page -= 1
+                continue
+
+            print(f"\n📖 Your recipes (page {page + 1}):")
+            for row in rows:
+                line = f"  {row['id']}. {row['name']} (added {row['created_at']})"
+                if row["preview"]:
+                    line += f" — {row['preview']}"
+                print(line)
+
+            choice = input(
+                "\nRecipe number to view, n for next page, p for previous, "
+                "enter to go back: "
+            ).strip().lower()
+            if choice.isdigit():
+                self.show_recipe_details(int(choice))
+                return
+            if choice == "n":
+                page += 1
+            elif choice == "p" and page > 0:
+                page -= 1
+            elif not choice:
+                return
+
+    def show_recipe_details(self, recipe_id):
+        row = self.conn.execute(
+            "SELECT name, ingredients, steps FROM recipes WHERE id = ?",
+            (recipe_id,),
+        ).fetchone()
+        if not row:
+            print("Recipe not found.")
+            return
+
+        print(f"\n🍳 {row[0]}")
+        print("\nIngredients:")
+        for ingredient in _loads(row[1]):
+            print(f"  - {ingredient}")
+        print("\nSteps:")
+        for i, step in enumerate(_loads(row[2]), 1):
+            print(f"  {i}. {step}")
+
+    def search_recipes(self):
+        query = input("\n🔍 Search for: ").strip()
+        if not query:
+            return
+        rows = None
+        if self.fts_enabled:
+            # Inverted-index lookup across name, ingredients and steps,
+            # best matches first. Embedded double quotes are doubled
+            # (FTS5's escape) so input like 'say "cheese' stays a valid
+            # phrase query instead of crashing the menu.
+            phrase = '"' + query.replace('"', '""') + '"'
+            try:
+                rows = self.conn.execute(
+                    "SELECT rowid, name FROM recipes_fts "
+                    "WHERE recipes_fts MATCH ? "
+                    "ORDER BY bm25(recipes_fts) LIMIT 20",
+                    (phrase,),
+                ).fetchall()
+            except sqlite3.OperationalError:
+                rows = None
+        if rows is None:
+            rows = self.conn.execute(
+                "SELECT id, name FROM recipes WHERE name LIKE ?",
+                (f"%{query}%",),
+            ).fetchall()
+        if not rows:
+            print("No matches found.")
+            return
+        for row in rows:
+            print(f"  {row[0]}. {row[1]}")
+        choice = input("\nEnter a recipe number to view it (enter to skip): ").strip()
+        if choice.isdigit():
+            self.show_recipe_details(int(choice))
+
+    # ----- voice cooking -----
+
+    def prepare_voice_cooking(self, recipe_id):
+        """Stage a recipe for the voice-guidance session."""
+        row = self.conn.execute(
+            "SELECT name, ingredients, steps FROM recipes WHERE id = ?",
+            (recipe_id,),
+        ).fetchone()
+        if not row:
+            print("Recipe not found.")
+            return False
+
+        # Keep the staged recipe in memory; round-tripping it through
+        # current_recipe.json was pure serialize/deserialize overhead
+        # within the same process.
+        self.current_recipe = {
+            "name": row[0],
+            "ingredients": _loads(row[1]),
+            "steps": _loads(row[2]),
+        }
+        return True
+
+    def voice_cooking(self):
+        """Pick a recipe and cook it with voice guidance."""
+        if not self.speech_key:
+            print("Voice guidance isn't set up. Add AZURE_SPEECH_KEY to your .env file.")
+            return
+
+        self.view_recipes()
+        choice = input("\nWhich recipe number do you want to cook? ").strip()
+        if not choice.isdigit():
+            return
+        if not self.prepare_voice_cooking(int(choice)):
+            return
+        self.start_voice_guidance(self.current_recipe)
+
+    def start_voice_guidance(self, recipe):
+        """Walk through a recipe's steps with Azure TTS and recognition."""
+        speechsdk = self._get_speechsdk()
+        speech_config = speechsdk.SpeechConfig(
+            subscription=self.speech_key, region=self.speech_region
+        )
+        speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+        synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
+        # Second synthesizer with no audio output: used by the prefetch
+        # thread to render upcoming steps to in-memory WAV bytes.
+        data_synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=speech_config, audio_config=None
+        )
+        recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config)
+        executor = ThreadPoolExecutor(max_workers=2)
+        prefetched = {}
+
+        # One long-lived recognition stream for the whole session instead
+        # of a fresh websocket handshake per utterance.
+        utterances = queue.Queue()
+
+        def on_recognized(evt):
+            if evt.result.text:
+                utterances.put(evt.result.text)
+
+        recognizer.recognized.connect(on_recognized)
+        recognizer.start_continuous_recognition_async().get()
+
+        def speak(text):
+            print(f"🤖 {text}")
+            # Repeats ("repeat", re-cooking a saved recipe) replay the
+            # cached WAV instead of re-synthesizing over the network.
+            cached = _tts_cache_load(text)
+            if cached is not None and _play_wav_bytes(cached):
+                return
+            result = synthesizer.speak_text_async(text).get()
+            done = speechsdk.ResultReason.SynthesizingAudioCompleted
+            if result.reason == done and result.audio_data:
+                _tts_cache_store(text, result.audio_data)
+
+        def prefetch_step(index):
+            """Start synthesizing a step in the background."""
+            if simpleaudio is None:
+                return
+            if 0 <= index < len(steps) and index not in prefetched:
+                text = f"Step {index + 1}: {steps[index]}"
+                if _tts_cache_load(text) is not None:
+                    return
+                prefetched[index] = executor.submit(
+                    lambda t=text: data_synthesizer.speak_text_async(t).get()
+                )
+
+        def speak_step(index):
+            """Speak a step, preferring prefetched audio, and kick off the
+            synthesis of the following step while this one plays."""
+            prefetch_step(index + 1)
+            text = f"Step {index + 1}: {steps[index]}"
+            future = prefetched.pop(index, None)
+            if future is not None:
+                result = future.result()
+                done = speechsdk.ResultReason.SynthesizingAudioCompleted
+                if result.reason == done and result.audio_data:
+                    _tts_cache_store(text, result.audio_data)
+                    if _play_wav_bytes(result.audio_data):
+                        print(f"🤖 {text}")
+                        return
+            speak(text)
+
+        def listen():
+            print("🎤 Listening...")
+            try:
+                text = utterances.get(timeout=60)
+            except queue.Empty:
+                return ""
+            print(f"👤 {text}")
+            return text.lower()
+
+        steps = recipe["steps"]
+        speak(f"Let's cook {recipe['name']}! Say next to move on, repeat to "
+              "hear a step again, or stop to finish.")
+        i = 0
+        speak_step(0)
+        while True:
+            command = listen()
+            if not command:
+                continue
+            if "stop" in command or "quit" in command:
+                speak("Happy cooking! Goodbye.")
+                break
+            elif "next" in command or "continue" in command:
+                if i + 1 >= len(steps):
+                    speak(f"That was the last step. {recipe['name']} is ready, enjoy!")
+                    break
+                i += 1
+                speak_step(i)
+            elif "repeat" in command or "again" in command:
+                speak_step(i)
+        recognizer.stop_continuous_recognition_async().get()
+        executor.shutdown(wait=False)
+
+    # ----- menu -----
+
+    def run(self):
+        print("🍳 Welcome to Su-Chef!")
+        while True:
+            print("\nWhat would you like to do?")
+            print("  1. Add a recipe")
+            print("  2. Generate a recipe with AI")
+            print("  3. Generate recipe variations with AI")
+            print("  4. View recipes")
+            print("  5. Search recipes")
+            print("  6. Cook with voice guidance")
+            print("  7. Plan meals in bulk (AI batch)")
+            print("  8. Check bulk meal plan results")
+            print("  9. Exit")
+            choice = input("> ").strip()
+            if choice == "1":
+                self.create_recipe()
+            elif choice == "2":
+                self.generate_ai_recipe()
+            elif choice == "3":
+                self.generate_ai_variations()
+            elif choice == "4":
+                self.view_recipes()
+            elif choice == "5":
+                self.search_recipes()
+            elif choice == "6":
+                self.voice_cooking()
+            elif choice == "7":
+                self.submit_meal_plan_batch()
+            elif choice == "8":
+                self.check_batch_results()
+            elif choice == "9":
+                print("👋 Happy cooking!")
+                break
+            else:
+                print("Please pick 1-9.")
+
+
+if __name__ == "__main__":
+    SimpleSuChef().run()
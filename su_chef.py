@@ -0,0 +1,333 @@
+"""Su-Chef main application.
+
+Ties together the database, the OpenAI recipe generator, the shared
+terminal helpers and the voice agent into one menu-driven assistant.
+"""
+
+import os
+import pickle
+from collections import OrderedDict
+
+from database import RecipeDatabase
+
+# dotenv, the voice agent (which drags in the Azure Speech SDK) and
+# recipe_generator (which drags in openai and numpy) are imported lazily:
+# a session that only browses saved recipes never pays for them.
+from utils import (
+    _ingredients,
+    _steps,
+    build_recipe_prompt,
+    display_menu,
+    display_recipe_details,
+    display_recipe_preview,
+    format_user_statistics,
+    get_numbered_choice,
+    get_user_confirmation,
+    parse_ingredients_input,
+    save_recipe_for_voice_guidance,
+)
+
+# Menu literals for the generation workflow, hoisted so the retry loop
+# (and repeated workflow runs) don't rebuild them.
+_SATISFACTION_OPTIONS = [
+    "Yes, I like this recipe",
+    "No, generate a different recipe",
+    "Cancel and return to main menu",
+]
+_SATISFACTION_MAP = {"1": "accept", "2": "different", "3": "cancel"}
+
+_DIETARY_OPTIONS = [
+    "None", "Vegetarian", "Vegan", "Gluten-free", "Dairy-free", "Keto",
+]
+_DIETARY_MAP = {str(i): str(i) for i in range(1, 7)}
+
+_ENV_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "su_chef")
+
+
+def _load_env():
+    """Load .env, caching the parsed variables keyed on the file's mtime.
+
+    Warm starts read one small pickle instead of importing dotenv and
+    re-tokenizing .env on every launch; editing .env changes the mtime
+    and invalidates the snapshot.
+    """
+    try:
+        mtime = os.stat(".env").st_mtime_ns
+    except OSError:
+        return
+    cache_path = os.path.join(_ENV_CACHE_DIR, f"env.{mtime}.pkl")
+    try:
+        with open(cache_path, "rb") as f:
+            values = pickle.load(f)
+    except (OSError, pickle.PickleError):
+        from dotenv import dotenv_values
+
+        values = {k: v for k, v in dotenv_values(".env").items() if v is not None}
+        try:
+            os.makedirs(_ENV_CACHE_DIR, exist_ok=True)
+            for name in os.listdir(_ENV_CACHE_DIR):
+                if name.startswith("env.") and name.endswith(".pkl"):
+                    os.remove(os.path.join(_ENV_CACHE_DIR, name))
+            with open(cache_path, "wb") as f:
+                pickle.dump(values, f)
+        except OSError:
+            pass
+    # Same precedence as load_dotenv: real environment wins.
+    for key, value in values.items():
+        os.environ.setdefault(key, value)
+
+
+class SuChef:
+    """Menu-driven cooking assistant with users, history and voice mode."""
+
+    def __init__(self):
+        _load_env()
+        self.api_key = os.getenv("OPENAI_API_KEY")
+        self.db = RecipeDatabase()
+        self.user_id = None
+        self.user_name = None
+        self.current_recipe_id = None
+        self.voice_agent = None
+        # Recently viewed recipes; preview -> details -> voice guidance
+        # all hit the same id, so keep a small LRU instead of re-querying.
+        self._recipe_cache = OrderedDict()
+        # Statistics per user, invalidated whenever history changes, so
+        # reopening the stats screen doesn't rescan the history table.
+        self._stats_cache = {}
+
+    _RECIPE_CACHE_SIZE = 16
+
+    def _get_recipe(self, recipe_id):
+        """Recipe details via a small per-session LRU cache."""
+        recipe_data = self._recipe_cache.get(recipe_id)
+        if recipe_data is not None:
+            self._recipe_cache.move_to_end(recipe_id)
+            return recipe_data
+        recipe_data = self.db.get_recipe_details(recipe_id)
+        if recipe_data is not None:
+            self._recipe_cache[recipe_id] = recipe_data
+            if len(self._recipe_cache) > self._RECIPE_CACHE_SIZE:
+                self._recipe_cache.popitem(last=False)
+        return recipe_data
+
+    # ----- setup -----
+
+    def setup_user(self):
+        print("🍳 Welcome to Su-Chef!")
+        name = input("What's your name? ").strip()
+        while not name:
+            name = input("Please enter your name: ").strip()
+        self.user_name = name
+        self.user_id = self.db.add_user(name)
+        print(f"Nice to cook with you, {name}!")
+
+    def initialize_voice_agent(self):
+        """Create the voice agent on first use."""
+        if self.voice_agent is None:
+            from voice_agent import VoiceAgent
+
+            self.voice_agent = VoiceAgent()
+        return self.voice_agent
+
+    # ----- main menu -----
+
+    def main_menu(self):
+        while True:
+            display_menu(
+                "Su-Chef Main Menu",
+                [
+                    "Generate a new recipe",
+                    "Search my recipes",
+                    "My statistics",
+                    "Exit",
+                ],
+            )
+            choice = get_numbered_choice(
+                "> ", {"1": "generate", "2": "search", "3": "stats", "4": "exit"}
+            )
+            if choice == "generate":
+                self.generate_recipe_workflow()
+            elif choice == "search":
+                self.search_recipes_workflow()
+            elif choice == "stats":
+                self.show_user_statistics()
+            else:
+                print("👋 Happy cooking!")
+                break
+
+    # ----- recipe generation -----
+
+    def generate_recipe_workflow(self):
+        """Collect preferences, generate until satisfied, then save."""
+        if not self.api_key:
+            print("❌ Set OPENAI_API_KEY in your .env file first.")
+            return
+
+        display_menu("Meal Type", ["Breakfast", "Lunch", "Dinner", "Snack"])
+        meal_type = get_numbered_choice(
+            "> ", {"1": "breakfast", "2": "lunch", "3": "dinner", "4": "snack"}
+        )
+        cooking_time = input("How many minutes do you have? ").strip()
+        display_menu("Skill Level", ["Beginner", "Intermediate", "Advanced"])
+        skill_level = get_numbered_choice(
+            "> ", {"1": "beginner", "2": "intermediate", "3": "advanced"}
+        )
+        display_menu("Dietary Restrictions", _DIETARY_OPTIONS)
+        dietary_choice = get_numbered_choice("> ", _DIETARY_MAP)
+        dietary = _DIETARY_OPTIONS[int(dietary_choice) - 1].lower()
+        ingredients_input = input(
+            "Ingredients on hand? (comma separated, enter to skip): "
+        ).strip()
+        ingredients = parse_ingredients_input(ingredients_input)
+
+        # Both prompt variants are fixed for the session; build them once
+        # instead of re-assembling (and re-suffixing) on every retry.
+        base_prompt = build_recipe_prompt(
+            meal_type, cooking_time, skill_level, dietary, ingredients
+        )
+        alt_prompt = base_prompt + (
+            "\n\nPlease provide a DIFFERENT recipe than before, "
+            "with different main ingredients or technique."
+        )
+
+        attempt_count = 1
+        while True:
+            prompt = base_prompt if attempt_count == 1 else alt_prompt
+
+            print("\n🧑‍🍳 Generating your recipe...\n")
+            try:
+                from recipe_generator import get_recipe_from_openai
+
+                # Retries bypass the cache: their prompt barely differs
+                # from the rejected attempt, so the similarity fallback
+                # would hand back the same recipe forever.
+                recipe_text = get_recipe_from_openai(
+                    prompt,
+                    self.api_key,
+                    (meal_type, cooking_time, skill_level, dietary,
+                     ",".join(sorted(i.lower() for i in ingredients)),
+                     attempt_count),
+                    fresh=attempt_count > 1,
+                )
+            except Exception as e:
+                print(f"❌ Generation failed: {e}")
+                return
+
+            display_menu("Are you happy with this recipe?", _SATISFACTION_OPTIONS)
+            choice = get_numbered_choice("> ", _SATISFACTION_MAP)
+            if choice == "accept":
+                from recipe_generator import process_recipe
+
+                recipe = process_recipe(
+                    recipe_text, meal_type, cooking_time, skill_level, dietary
+                )
+                self.current_recipe_id = self.db.save_recipe(recipe, self.user_id)
+                self._invalidate_stats(self.user_id)
+                print(f"✅ Saved '{recipe['name']}'!")
+                self._recipe_action_menu()
+                return
+            if choice == "cancel":
+                return
+            attempt_count += 1
+
+    # ----- browsing -----
+
+    def search_recipes_workflow(self):
+        query = input("\n🔍 Search your recipes for: ").strip()
+        if not query:
+            return
+        results = self.db.search_recipes_by_name(query)
+        if not results:
+            print("No matches found.")
+            return
+        print()
+        for i, recipe in enumerate(results, 1):
+            print(f"{i}. {recipe.name} ({recipe.meal_type}, {recipe.cooking_time} min)")
+        choice = input("\nPick a number to view it (enter to skip): ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(results):
+            self.current_recipe_id = results[int(choice) - 1].recipe_id
+            self.show_recipe_preview()
+            self._recipe_action_menu()
+
+    def show_recipe_preview(self):
+        recipe_data = self._get_recipe(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        display_recipe_preview(recipe_data)
+
+    def view_recipe_details(self):
+        recipe_data = self._get_recipe(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        display_recipe_details(recipe_data)
+
+    def _recipe_action_menu(self):
+        while True:
+            display_menu(
+                "Recipe Options",
+                ["View full recipe", "Cook with voice guidance", "Back"],
+            )
+            choice = get_numbered_choice(
+                "> ", {"1": "details", "2": "voice", "3": "back"}
+            )
+            if choice == "details":
+                self.view_recipe_details()
+            elif choice == "voice":
+                self.start_voice_guidance_workflow()
+            else:
+                return
+
+    # ----- voice guidance -----
+
+    def start_voice_guidance_workflow(self):
+        recipe_data = self._get_recipe(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        if not save_recipe_for_voice_guidance(recipe_data):
+            return
+
+        recipe = recipe_data["recipe"]
+        try:
+            agent = self.initialize_voice_agent()
+        except Exception as e:
+            print(f"❌ Could not start voice guidance: {e}")
+            return
+        agent.run_voice_guidance(
+            {
+                "name": recipe.name,
+                "ingredients": _ingredients(recipe_data),
+                "steps": _steps(recipe_data),
+            }
+        )
+
+        if get_user_confirmation("Did you cook this recipe?"):
+            liked = get_user_confirmation("Did you like it?")
+            self.db.mark_recipe_cooked(self.current_recipe_id, self.user_id, liked)
+            self._recipe_cache.pop(self.current_recipe_id, None)
+            self._invalidate_stats(self.user_id)
+            print("✅ Added to your cooking history!")
+
+    # ----- statistics -----
+
+    def _invalidate_stats(self, user_id):
+        self._stats_cache.pop(user_id, None)
+
+    def show_user_statistics(self):
+        stats = self._stats_cache.get(self.user_id)
+        if stats is None:
+            stats = self.db.get_user_statistics(self.user_id)
+            self._stats_cache[self.user_id] = stats
+        print(format_user_statistics(self.user_name, stats))
+
+
+def main():
+    app = SuChef()
+    app.setup_user()
+    app.main_menu()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,524 @@
+"""Su-Chef manager.
+
+Menu-driven front end that ties the recipe database, the OpenAI recipe
+generator and the voice-guided cooking agent together. Unlike su_chef.py
+it is self-contained: it owns its menus and display helpers instead of
+going through utils.
+"""
+
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from database import RecipeDatabase
+
+# cooking_agent (which drags in the Azure Speech SDK) and
+# recipe_generator (openai, numpy) are imported lazily so a session that
+# only browses or checks statistics never pays their startup cost.
+
+
+# Banner separators, built once at import; these show up in every menu
+# tick and recipe card.
+_BAR60 = "=" * 60
+_BAR50 = "=" * 50
+_DASH40 = "-" * 40
+
+# Choice maps for the generation questionnaire, built once at import
+# instead of per workflow run.
+_MEAL_MAP = {"1": "breakfast", "2": "lunch", "3": "dinner", "4": "snack"}
+_SKILL_MAP = {"1": "beginner", "2": "intermediate", "3": "advanced"}
+_DIETARY_MAP = {
+    "1": "none", "2": "vegetarian", "3": "vegan",
+    "4": "gluten-free", "5": "dairy-free", "6": "keto",
+}
+_MEAL_VALID = frozenset(_MEAL_MAP)
+_SKILL_VALID = frozenset(_SKILL_MAP)
+_DIETARY_VALID = frozenset(_DIETARY_MAP)
+
+# Generation prompt, with the static sections precomputed; the two
+# optional blocks are formatted in (possibly empty) per call. The
+# output-format rubric is the generator's system message, not part of
+# this template.
+_PROMPT_TEMPLATE = (
+    "Create a {meal_type} recipe that:\n"
+    "- Takes {cooking_time} minutes or less to prepare\n"
+    "- Is suitable for a {skill_level} cook\n"
+    "{dietary_block}{ingredients_block}"
+)
+
+
+def _loads(blob):
+    """Decode a JSON column with orjson when installed."""
+    return orjson.loads(blob) if orjson is not None else json.loads(blob)
+
+
+def _make_cooking_agent():
+    """Import (Azure SDK and all) and construct the cooking agent."""
+    from cooking_agent import CookingAgent
+
+    return CookingAgent()
+
+
+# Background worker for parsing/saving while the user reads a prompt.
+_executor = ThreadPoolExecutor(max_workers=2)
+
+
+def _parsed_ingredients(recipe_data):
+    """Decoded ingredients, parsed once and cached on the details dict.
+
+    The database pre-populates "_ingredients" for payload-backed rows;
+    otherwise the JSON text column is decoded here on first use.
+    """
+    cached = recipe_data.get("_ingredients")
+    if cached is None:
+        cached = recipe_data["_ingredients"] = _loads(recipe_data["recipe"][6])
+    return cached
+
+
+def _parsed_steps(recipe_data):
+    """Decoded steps, parsed once and cached on the details dict."""
+    cached = recipe_data.get("_steps")
+    if cached is None:
+        cached = recipe_data["_steps"] = _loads(recipe_data["recipe"][7])
+    return cached
+
+
+class SuChefManager:
+    """Interactive manager for generating, browsing and cooking recipes."""
+
+    def __init__(self):
+        load_dotenv()
+        self.openai_key = os.getenv("OPENAI_API_KEY")
+        self.db = RecipeDatabase()
+        self.user_id = None
+        self.user_name = None
+        self.current_recipe_id = None
+        self.voice_agent = None
+        # Prewarm the cooking agent (Azure SDK init takes a few hundred
+        # ms) behind the username prompt instead of on first use.
+        if os.getenv("AZURE_SPEECH_KEY"):
+            self._agent_future = _executor.submit(_make_cooking_agent)
+        else:
+            self._agent_future = None
+        # Cache-aside store for recipe details: the row never changes
+        # while the user sits in a menu loop, so preview -> details ->
+        # voice guidance hit SQLite once instead of once per screen.
+        self._recipe_cache = {}
+        # Prepared voice-guidance payloads, keyed by recipe id.
+        self._voice_steps = {}
+        # Statistics per user, cache-aside; dropped whenever that user's
+        # history changes.
+        self._stats_cache = {}
+
+    def _get_recipe_details(self, recipe_id):
+        """Recipe details dict, fetched once per session and cached."""
+        recipe_data = self._recipe_cache.get(recipe_id)
+        if recipe_data is None:
+            recipe_data = self.db.get_recipe_details(recipe_id)
+            if recipe_data is not None:
+                self._recipe_cache[recipe_id] = recipe_data
+        return recipe_data
+
+    # ----- setup -----
+
+    def setup_user(self):
+        print("🍳 Welcome to Su-Chef!")
+        name = input("What's your name? ").strip()
+        while not name:
+            name = input("Please enter your name: ").strip()
+        self.user_name = name
+        self.user_id = self.db.add_user(name)
+        print(f"Nice to cook with you, {name}!")
+
+    def initialize_voice_agent(self):
+        """The cooking agent, prewarmed in the background when possible."""
+        if self.voice_agent is None:
+            if self._agent_future is not None:
+                self.voice_agent = self._agent_future.result()
+                self._agent_future = None
+            else:
+                self.voice_agent = _make_cooking_agent()
+        return self.voice_agent
+
+    @staticmethod
+    def _yn(prompt):
+        """Yes/no prompt: checks the first keystroke instead of
+        lowercasing and comparing the whole answer."""
+        answer = input(prompt).strip()
+        return bool(answer) and answer[0] in ("y", "Y")
+
+    # ----- menus -----
+
+    # Menu text and dispatch tables are class constants: each loop tick
+    # is one print of a prebuilt string and one dict lookup instead of a
+    # rebuilt banner plus an if/elif ladder. A None action means "leave
+    # this menu".
+
+    _MAIN_MENU_TEXT = (
+        "\n" + _BAR60 + "\n" + "Su-Chef Manager".center(60) + "\n" + _BAR60
+        + "\n1. Generate a new recipe"
+        "\n2. Search my recipes"
+        "\n3. Cook from a prepared recipe file"
+        "\n4. My statistics"
+        "\n5. Exit"
+    )
+    _MAIN_MENU_ACTIONS = {
+        "1": "generate_recipe_workflow",
+        "2": "search_recipes_workflow",
+        "3": "file_recipe_action_menu",
+        "4": "show_user_statistics",
+        "5": None,
+    }
+
+    _RECIPE_MENU_TEXT = (
+        "\n" + _DASH40
+        + "\n1. View full recipe"
+        "\n2. Cook with voice guidance"
+        "\n3. Back"
+    )
+    _RECIPE_MENU_ACTIONS = {
+        "1": "view_recipe_details",
+        "2": "start_voice_guidance_workflow",
+        "3": None,
+    }
+
+    _FILE_MENU_TEXT = (
+        "\n" + _DASH40
+        + "\n1. Start voice guidance from steps.json"
+        "\n2. Back"
+    )
+    _FILE_MENU_ACTIONS = {"1": "_run_file_recipe", "2": None}
+
+    def _run_menu(self, text, actions):
+        """Shared menu loop: print the banner, dispatch on the choice."""
+        while True:
+            print(text)
+            choice = input("> ").strip()
+            if choice not in actions:
+                print("❌ Invalid choice, please try again.")
+                continue
+            handler = actions[choice]
+            if handler is None:
+                return
+            getattr(self, handler)()
+
+    def main_menu(self):
+        self._run_menu(self._MAIN_MENU_TEXT, self._MAIN_MENU_ACTIONS)
+        print("👋 Happy cooking!")
+
+    def recipe_action_menu(self):
+        self._run_menu(self._RECIPE_MENU_TEXT, self._RECIPE_MENU_ACTIONS)
+
+    def file_recipe_action_menu(self):
+        """Cook straight from steps.json, e.g. after a crash mid-session."""
+        self._run_menu(self._FILE_MENU_TEXT, self._FILE_MENU_ACTIONS)
+
+    def _run_file_recipe(self):
+        try:
+            agent = self.initialize_voice_agent()
+        except Exception as e:
+            print(f"❌ Could not start voice guidance: {e}")
+            return
+        if agent.load_recipe():
+            agent.run()
+
+    # ----- recipe generation -----
+
+    def generate_recipe_workflow(self):
+        """Collect preferences, generate a recipe, offer to save it."""
+        if not self.openai_key:
+            print("❌ Set OPENAI_API_KEY in your .env file first.")
+            return
+
+        print("\nMeal type: 1. Breakfast  2. Lunch  3. Dinner  4. Snack")
+        meal_choice = input("> ").strip()
+        while meal_choice not in _MEAL_VALID:
+            print("❌ Invalid choice, please try again.")
+            meal_choice = input("> ").strip()
+        meal_type = _MEAL_MAP[meal_choice]
+
+        # Single int() parse per attempt; isdigit()-then-int walked the
+        # string twice and rejected nothing int() doesn't.
+        while True:
+            try:
+                cooking_time = int(input("How many minutes do you have? ").strip())
+                if cooking_time > 0:
+                    break
+            except ValueError:
+                pass
+            print("❌ Please enter a positive number of minutes.")
+
+        print("Skill level: 1. Beginner  2. Intermediate  3. Advanced")
+        skill_choice = input("> ").strip()
+        while skill_choice not in _SKILL_VALID:
+            print("❌ Invalid choice, please try again.")
+            skill_choice = input("> ").strip()
+        skill_level = _SKILL_MAP[skill_choice]
+
+        print(
+            "Dietary restrictions: 1. None  2. Vegetarian  3. Vegan  "
+            "4. Gluten-free  5. Dairy-free  6. Keto"
+        )
+        dietary_choice = input("> ").strip()
+        while dietary_choice not in _DIETARY_VALID:
+            print("❌ Invalid choice, please try again.")
+            dietary_choice = input("> ").strip()
+        dietary_restrictions = _DIETARY_MAP[dietary_choice]
+
+        ingredients_input = input(
+            "Ingredients on hand? (comma separated, enter to skip): "
+        ).strip()
+
+        prompt = _PROMPT_TEMPLATE.format(
+            meal_type=meal_type,
+            cooking_time=cooking_time,
+            skill_level=skill_level,
+            dietary_block=(
+                f"- Is {dietary_restrictions}\n"
+                if dietary_restrictions != "none" else ""
+            ),
+            ingredients_block=(
+                f"- Uses these ingredients: {ingredients_input}\n"
+                if ingredients_input else ""
+            ),
+        )
+
+        # The banner goes up before the call: get_recipe_from_openai
+        # streams tokens to stdout as they arrive, so the user reads the
+        # recipe while it is still generating instead of staring at a
+        # blank screen for the full completion latency.
+        print("\n" + _BAR50)
+        print("GENERATED RECIPE:")
+        print(_BAR50)
+        try:
+            from recipe_generator import get_recipe_from_openai
+
+            # The params key lets the generator's cache reuse an earlier
+            # completion for identical asks without hitting the API.
+            recipe_text = get_recipe_from_openai(
+                prompt,
+                self.openai_key,
+                (meal_type, cooking_time, skill_level, dietary_restrictions,
+                 ingredients_input),
+            )
+        except Exception as e:
+            print(f"❌ Generation failed: {e}")
+            return
+
+        from recipe_generator import process_recipe
+
+        # Parse in the background while the user decides whether to keep
+        # the recipe — the regex work hides entirely behind think-time.
+        parse_future = _executor.submit(
+            process_recipe, recipe_text, meal_type, cooking_time, skill_level,
+            dietary_restrictions,
+        )
+
+        if self._yn("\nSave this recipe? (y/n): "):
+            recipe_data = parse_future.result()
+            # Overlap the SQLite write with voice-guidance prep: the
+            # save runs on the worker while the agent prewarms (if it
+            # hasn't already) and the voice payload is built straight
+            # from the in-memory recipe, no re-fetch or re-parse.
+            save_future = _executor.submit(
+                self.db.save_recipe, recipe_data, self.user_id
+            )
+            if (self.voice_agent is None and self._agent_future is None
+                    and os.getenv("AZURE_SPEECH_KEY")):
+                self._agent_future = _executor.submit(_make_cooking_agent)
+            steps_data = {
+                "recipe_name": recipe_data["name"],
+                "ingredients": recipe_data["ingredients"],
+                "steps": [
+                    {"step": i, "text": step}
+                    for i, step in enumerate(recipe_data["steps"], 1)
+                ],
+            }
+            self.current_recipe_id = save_future.result()
+            self._voice_steps[self.current_recipe_id] = steps_data
+            self._stats_cache.pop(self.user_id, None)
+            print(f"✅ Saved '{recipe_data['name']}'!")
+            self.show_recipe_preview()
+            self.recipe_action_menu()
+
+    # ----- browsing -----
+
+    def search_recipes_workflow(self):
+        query = input("\n🔍 Search your recipes for: ").strip()
+        if not query:
+            return
+        # Peek the first two rows lazily: no match and exactly-one-match
+        # (the common "search by name" case) are decided without
+        # materializing or enumerating the rest of the result set.
+        results_iter = self.db.search_recipes_iter(query)
+        first = next(results_iter, None)
+        if first is None:
+            print("No matches found.")
+            return
+        second = next(results_iter, None)
+        if second is None:
+            self.current_recipe_id = first.recipe_id
+            self.show_recipe_preview()
+            self.recipe_action_menu()
+            return
+        results = [first, second, *results_iter]
+        print()
+        for i, recipe in enumerate(results, 1):
+            print(f"{i}. {recipe.name} ({recipe.meal_type}, {recipe.cooking_time} min)")
+        # Prefetch details for every listed candidate while the user
+        # decides: the fetches overlap think-time, so whichever recipe
+        # they pick, its preview is already a cache hit.
+        for recipe in results:
+            _executor.submit(self._get_recipe_details, recipe.recipe_id)
+        recipe_choice = input("\nPick a number to view it (enter to skip): ").strip()
+        try:
+            index = int(recipe_choice)
+        except ValueError:
+            return
+        if 1 <= index <= len(results):
+            self.current_recipe_id = results[index - 1].recipe_id
+            self.show_recipe_preview()
+            self.recipe_action_menu()
+
+    def show_recipe_preview(self):
+        recipe_data = self._get_recipe_details(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        recipe = recipe_data["recipe"]
+        # One stdout write for the whole card instead of a lock/flush
+        # per line.
+        lines = [
+            "\n" + _BAR50,
+            f"🍳 {recipe.name}",
+            _BAR50,
+            f"Meal type: {recipe.meal_type}",
+            f"Cooking time: {recipe.cooking_time} minutes",
+            f"Skill level: {recipe.skill_level}",
+        ]
+        if recipe.dietary_restrictions:
+            lines.append(f"Dietary: {recipe.dietary_restrictions}")
+        ingredients = _parsed_ingredients(recipe_data)
+        lines.append("\nMain ingredients:")
+        lines.extend(f"  - {ingredient}" for ingredient in ingredients[:5])
+        if len(ingredients) > 5:
+            lines.append(f"  ... and {len(ingredients) - 5} more")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def view_recipe_details(self):
+        recipe_data = self._get_recipe_details(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        recipe = recipe_data["recipe"]
+        lines = [
+            "\n" + _BAR50,
+            f"🍳 {recipe.name}",
+            _BAR50,
+            f"Meal type: {recipe.meal_type}",
+            f"Cooking time: {recipe.cooking_time} minutes",
+            f"Skill level: {recipe.skill_level}",
+        ]
+        if recipe.dietary_restrictions:
+            lines.append(f"Dietary: {recipe.dietary_restrictions}")
+        if recipe_data.get("times_cooked"):
+            lines.append(f"Times cooked: {recipe_data['times_cooked']}")
+        lines.append("\nIngredients:")
+        lines.extend(f"  - {i}" for i in _parsed_ingredients(recipe_data))
+        lines.append("\n👨‍🍳 Steps:")
+        lines.extend(
+            f"  {i}. {step}"
+            for i, step in enumerate(_parsed_steps(recipe_data), 1)
+        )
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    # ----- voice guidance -----
+
+    def prepare_recipe_for_voice_guidance(self, recipe_data):
+        """Build the structured recipe dict the cooking agent consumes.
+
+        Handed to the agent in memory — same process, so serializing to
+        steps.json and parsing it straight back was pure overhead. The
+        built dict is memoized per recipe id for repeat cook-throughs.
+        """
+        recipe = recipe_data["recipe"]
+        steps_data = self._voice_steps.get(recipe.recipe_id)
+        if steps_data is None:
+            steps = _parsed_steps(recipe_data)
+            steps_data = {
+                "recipe_name": recipe.name,
+                "ingredients": _parsed_ingredients(recipe_data),
+                "steps": [
+                    {"step": i, "text": step} for i, step in enumerate(steps, 1)
+                ],
+            }
+            self._voice_steps[recipe.recipe_id] = steps_data
+        return steps_data
+
+    def start_voice_guidance_workflow(self):
+        recipe_data = self._get_recipe_details(self.current_recipe_id)
+        if recipe_data is None:
+            print("Recipe not found.")
+            return
+        steps_data = self.prepare_recipe_for_voice_guidance(recipe_data)
+        try:
+            agent = self.initialize_voice_agent()
+        except Exception as e:
+            print(f"❌ Could not start voice guidance: {e}")
+            return
+        if agent.load_recipe(steps_data=steps_data):
+            agent.run()
+        self._mark_recipe_completed()
+
+    def _mark_recipe_completed(self):
+        if self._yn("Did you cook this recipe? (y/n): "):
+            liked = self._yn("Did you like it? (y/n): ")
+            self.db.mark_recipe_cooked(self.current_recipe_id, self.user_id, liked)
+            # The cached details carry stale times_cooked/liked counters now.
+            self._recipe_cache.pop(self.current_recipe_id, None)
+            self._stats_cache.pop(self.user_id, None)
+            print("✅ Added to your cooking history!")
+
+    # ----- statistics -----
+
+    def show_user_statistics(self):
+        # One SQL aggregate instead of materializing the whole history
+        # and scanning it three times in Python.
+        stats = self._stats_cache.get(self.user_id)
+        if stats is None:
+            stats = self.db.get_user_statistics(self.user_id)
+            self._stats_cache[self.user_id] = stats
+        total, cooked, liked = stats
+        print(f"\n📊 Statistics for {self.user_name}")
+        print(f"Recipes generated: {total}")
+        if not total:
+            print("No recipes yet - generate one to get started!")
+            return
+        print(f"Recipes cooked: {cooked} ({cooked / total * 100:.1f}%)")
+        print(f"Recipes liked: {liked} ({liked / total * 100:.1f}%)")
+
+
+def main():
+    manager = SuChefManager()
+    try:
+        manager.setup_user()
+        manager.main_menu()
+    except KeyboardInterrupt:
+        print("\n👋 Happy cooking!")
+    except Exception:
+        traceback.print_exc()
+    finally:
+        manager.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Shared terminal helpers for Su-Chef.
+
+Menus, user input handling, and display formatting used by the main
+application, kept separate so the workflow code stays readable.
+"""
+
+import json
+import os
+import re
+import sys
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Separator lines ("=" * width) memoized by width; these are rebuilt on
+# every menu and recipe view otherwise.
+_SEP_CACHE = {}
+
+# Comma separators with surrounding whitespace, so splitting ingredient
+# input trims in the same C-level pass.
+_ING_SPLIT = re.compile(r"\s*,\s*")
+
+
+def _sep(width):
+    return _SEP_CACHE.setdefault(width, "=" * width)
+
+
+def _ingredients(recipe_data):
+    """Decoded ingredients for a recipe-details dict, parsed once.
+
+    The ingredients blob is stored as JSON text at index 6 of the recipe
+    row; previews, detail views and voice guidance all need the decoded
+    list, so it is cached on recipe_data after the first parse.
+    """
+    cached = recipe_data.get("_ingredients")
+    if cached is None:
+        blob = recipe_data["recipe"].ingredients_json
+        cached = orjson.loads(blob) if orjson is not None else json.loads(blob)
+        recipe_data["_ingredients"] = cached
+    return cached
+
+
+def _steps(recipe_data):
+    """Decoded steps for a recipe-details dict, parsed once.
+
+    Mirrors _ingredients: the database pre-populates "_steps" when the
+    recipe carries a compressed payload, otherwise the JSON text column
+    is decoded here and cached for the next caller.
+    """
+    cached = recipe_data.get("_steps")
+    if cached is None:
+        blob = recipe_data["recipe"].steps_json
+        cached = orjson.loads(blob) if orjson is not None else json.loads(blob)
+        recipe_data["_steps"] = cached
+    return cached
+
+
+def display_menu(title, options, width=40):
+    """Print a framed menu with numbered options."""
+    sep = _sep(width)
+    # One write for the whole frame instead of a print per line.
+    sys.stdout.write(
+        "\n" + sep + "\n" + title.center(width) + "\n" + sep + "\n"
+        + "\n".join(f"{i}. {option}" for i, option in enumerate(options, 1))
+        + "\n"
+    )
+
+
+def get_numbered_choice(prompt, valid_choices):
+    """Ask until the user enters a key in valid_choices; return its value."""
+    keys = frozenset(valid_choices)
+    while True:
+        choice = input(prompt).strip()
+        if choice in keys:
+            return valid_choices[choice]
+        print("❌ Invalid choice, please try again.")
+
+
+def get_user_confirmation(prompt):
+    """Ask a yes/no question until the user answers one or the other."""
+    while True:
+        answer = input(f"{prompt} (y/n): ").strip().lower()
+        if answer in ("y", "yes"):
+            return True
+        if answer in ("n", "no"):
+            return False
+        print("❌ Please answer y or n.")
+
+
+def display_recipe_preview(recipe_data):
+    """Show a short summary of a recipe: name, basics, first ingredients."""
+    recipe = recipe_data["recipe"]
+    parts = [
+        "",
+        _sep(50),
+        f"🍳 {recipe.name}",
+        _sep(50),
+        f"Meal type: {recipe.meal_type}",
+        f"Cooking time: {recipe.cooking_time} minutes",
+        f"Skill level: {recipe.skill_level}",
+    ]
+    if recipe.dietary_restrictions:
+        parts.append(f"Dietary: {recipe.dietary_restrictions}")
+    ingredients = _ingredients(recipe_data)
+    parts.append("\nMain ingredients:")
+    parts.extend(f"  - {i}" for i in ingredients[:5])
+    if len(ingredients) > 5:
+        parts.append(f"  ... and {len(ingredients) - 5} more")
+    sys.stdout.write("\n".join(parts) + "\n")
+
+
+def display_recipe_details(recipe_data):
+    """Show the full recipe: every ingredient and every step."""
+    # Built as one block and written once: a long recipe would otherwise
+    # cost a stdout lock/flush per ingredient and per step.
+    recipe = recipe_data["recipe"]
+    parts = [
+        "",
+        _sep(50),
+        f"🍳 {recipe.name}",
+        _sep(50),
+        f"Meal type: {recipe.meal_type}",
+        f"Cooking time: {recipe.cooking_time} minutes",
+        f"Skill level: {recipe.skill_level}",
+    ]
+    if recipe.dietary_restrictions:
+        parts.append(f"Dietary: {recipe.dietary_restrictions}")
+    if recipe_data.get("times_cooked"):
+        parts.append(f"Times cooked: {recipe_data['times_cooked']}")
+
+    parts.append("\nIngredients:")
+    parts.extend(f"  - {i}" for i in _ingredients(recipe_data))
+
+    steps = _steps(recipe_data)
+    parts.append("\nSteps:")
+    parts.extend(f"  {i}. {step}" for i, step in enumerate(steps, 1))
+    sys.stdout.write("\n".join(parts) + "\n")
+
+
+def format_user_statistics(name, stats):
+    """Build the statistics summary from a (total, cooked, liked) triple."""
+    total, cooked, liked = stats
+
+    if not total:
+        return (
+            f"\n📊 Statistics for {name}\n"
+            f"Recipes generated: 0\n"
+            "No recipes yet - generate one to get started!\n"
+        )
+    return (
+        f"\n📊 Statistics for {name}\n"
+        f"Recipes generated: {total}\n"
+        f"Recipes cooked: {cooked} ({cooked / total * 100:.1f}%)\n"
+        f"Recipes liked: {liked} ({liked / total * 100:.1f}%)\n"
+    )
+
+
+def build_recipe_prompt(meal_type, cooking_time, skill_level,
+                        dietary_restrictions, ingredients=None):
+    """Assemble the OpenAI prompt from the user's answers."""
+    parts = [
+        f"Create a {meal_type} recipe that:",
+        f"- Takes {cooking_time} minutes or less to prepare",
+        f"- Is suitable for a {skill_level} cook",
+    ]
+    if dietary_restrictions and dietary_restrictions != "none":
+        parts.append(f"- Is {dietary_restrictions}")
+    if ingredients:
+        parts.append("- Uses these ingredients: " + ", ".join(ingredients))
+    # The output-format rubric is not appended here: it lives in the
+    # generator's system message, keeping the request prefix identical
+    # across calls for provider-side prompt caching.
+    return "\n".join(parts)
+
+
+def parse_ingredients_input(ingredients_input):
+    """Split a comma-separated ingredients answer into a clean list."""
+    parts = _ING_SPLIT.split(ingredients_input.strip())
+    return [p for p in parts if p]
+
+
+# What each staged file currently holds, so re-entering voice guidance
+# for the same recipe skips the serialize + write entirely. Recipe rows
+# are immutable after creation, so (id, created_at) identifies content.
+_STAGED_RECIPES = {}
+
+
+def save_recipe_for_voice_guidance(recipe_data, filename="steps.json"):
+    """Write the staged recipe to the file the voice agent reads."""
+    recipe = recipe_data["recipe"]
+    staged_key = (recipe.recipe_id, recipe.created_at)
+    if _STAGED_RECIPES.get(filename) == staged_key and os.path.exists(filename):
+        return True
+    steps = _steps(recipe_data)
+    steps_data = {
+        "recipe_name": recipe.name,
+        "ingredients": _ingredients(recipe_data),
+        "steps": [{"step": i, "text": step} for i, step in enumerate(steps, 1)],
+    }
+    # No pretty-printing: only the voice agent reads this file. Write to
+    # a sidecar and rename so a crash can't leave it half-written.
+    if orjson is not None:
+        data = orjson.dumps(steps_data)
+    else:
+        data = json.dumps(steps_data).encode()
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, filename)
+        _STAGED_RECIPES[filename] = staged_key
+        return True
+    except OSError as e:
+        print(f"❌ Could not save recipe for voice guidance: {e}")
+        return False
@@ -0,0 +1,179 @@
+"""Voice guidance for Su-Chef.
+
+Reads a staged recipe aloud with Azure text-to-speech and listens for
+simple commands (next, repeat, stop, ingredients) so the user can cook
+hands-free.
+"""
+
+import os
+import queue
+from xml.sax.saxutils import escape
+
+import azure.cognitiveservices.speech as speechsdk
+from dotenv import load_dotenv
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Command vocabularies, matched per utterance either by one pass of an
+# Aho-Corasick automaton (when pyahocorasick is installed) or by token
+# set intersection — one hashed lookup per category. Both are whole-word
+# matches, so "donezo" doesn't count as "done".
+_CATEGORY_WORDS = {
+    "ready": frozenset({"ready", "start", "begin"}),
+    "next": frozenset({"next", "continue", "done"}),
+    "stop": frozenset({"stop", "quit", "exit"}),
+    "repeat": frozenset({"repeat", "again"}),
+    "ingredients": frozenset({"ingredient", "ingredients"}),
+}
+
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _category, _words in _CATEGORY_WORDS.items():
+        for _word in _words:
+            _AUTOMATON.add_word(_word, (_category, _word))
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+
+def _command_categories(response):
+    """The command categories mentioned in a recognized utterance."""
+    text = response.lower()
+    if _AUTOMATON is None:
+        tokens = frozenset(text.split())
+        return {cat for cat, words in _CATEGORY_WORDS.items() if tokens & words}
+    categories = set()
+    for end, (category, word) in _AUTOMATON.iter(text):
+        start = end - len(word) + 1
+        if (start == 0 or not text[start - 1].isalnum()) and (
+            end == len(text) - 1 or not text[end + 1].isalnum()
+        ):
+            categories.add(category)
+    return categories
+
+
+class VoiceAgent:
+    """Speaks recipe steps and listens for the user's commands."""
+
+    def __init__(self):
+        load_dotenv()
+        self.speech_key = os.getenv("AZURE_SPEECH_KEY")
+        self.speech_region = os.getenv("AZURE_SPEECH_REGION", "eastus")
+        self._pending_tts = None
+        self._setup_speech_services()
+
+    def _setup_speech_services(self):
+        speech_config = speechsdk.SpeechConfig(
+            subscription=self.speech_key, region=self.speech_region
+        )
+        speech_config.speech_synthesis_voice_name = "en-US-JennyNeural"
+        self.synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
+        self.recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config)
+        # One long-lived recognition stream for the whole agent instead
+        # of a fresh websocket handshake per utterance; recognized
+        # phrases land on a queue that listen() consumes.
+        self._utterance_q = queue.Queue()
+        self.recognizer.recognized.connect(self._on_recognized)
+        self.recognizer.start_continuous_recognition_async().get()
+
+    def _on_recognized(self, evt):
+        if evt.result.text:
+            self._utterance_q.put(evt.result.text)
+
+    def speak(self, text):
+        """Start speaking without blocking on playback.
+
+        The SDK renders queued requests in order, so consecutive speaks
+        stay sequential; only listen() has to wait for the audio to
+        finish (the mic would pick up our own voice otherwise).
+        """
+        print(f"🤖 {text}")
+        self._pending_tts = self.synthesizer.speak_text_async(text)
+        return self._pending_tts
+
+    def speak_sync(self, text):
+        """Blocking speak, for goodbyes and anything after the last listen."""
+        self.speak(text)
+        self._await_pending_tts()
+
+    def _await_pending_tts(self):
+        if self._pending_tts is not None:
+            self._pending_tts.get()
+            self._pending_tts = None
+
+    def speak_many(self, texts):
+        """Speak a list of items in one synthesis request.
+
+        Speaking them one speak() at a time costs a network round-trip
+        per item; a single SSML document with a short pause between
+        items is one round-trip for the whole list.
+        """
+        # Item text is user/recipe data — escape it so an ingredient
+        # like "salt & pepper" can't break the SSML document.
+        items = "".join(
+            f"<s>{escape(text)}</s><break time='400ms'/>" for text in texts
+        )
+        ssml = (
+            "<speak version='1.0' xml:lang='en-US'>"
+            "<voice name='en-US-JennyNeural'>" + items + "</voice></speak>"
+        )
+        for text in texts:
+            print(f"🤖 {text}")
+        self.synthesizer.speak_ssml_async(ssml).get()
+
+    def listen(self):
+        self._await_pending_tts()
+        print("🎤 Listening...")
+        try:
+            text = self._utterance_q.get(timeout=60)
+        except queue.Empty:
+            return ""
+        print(f"👤 {text}")
+        return text
+
+    def run_voice_guidance(self, recipe):
+        """Walk the user through a recipe, one spoken step at a time."""
+        self.speak(f"Let's cook {recipe['name']}! First, the ingredients.")
+        self.speak_many(recipe["ingredients"])
+        self.speak("Say ready when you want to start cooking.")
+
+        while True:
+            response = self.listen()
+            if not response:
+                continue
+            categories = _command_categories(response)
+            if "ready" in categories:
+                break
+            if "stop" in categories:
+                self.speak_sync("Okay, maybe next time. Goodbye!")
+                return
+
+        steps = recipe["steps"]
+        current = 0
+        self.speak(f"Step 1: {steps[0]}")
+
+        while True:
+            response = self.listen()
+            if not response:
+                continue
+            categories = _command_categories(response)
+
+            if "stop" in categories:
+                self.speak_sync("Happy cooking! Goodbye.")
+                break
+            elif "next" in categories:
+                if current + 1 >= len(steps):
+                    self.speak_sync(
+                        f"That was the last step. {recipe['name']} is ready, enjoy!"
+                    )
+                    break
+                current += 1
+                self.speak(f"Step {current + 1}: {steps[current]}")
+            elif "repeat" in categories:
+                self.speak(f"Step {current + 1}: {steps[current]}")
+            elif "ingredients" in categories:
+                self.speak_many(recipe["ingredients"])
+                self.speak(f"Back to step {current + 1}: {steps[current]}")